@@ -1,7 +1,8 @@
 import sys
 
 sys.path.append("..")
-from typing import Any, Callable, Dict, List, Optional
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 
 class TerraformResult:
@@ -28,10 +29,11 @@ class Terraform:
         __lock__ (bool): Whether to use state locking
         __lock_timeout__ (str): How long to wait for state lock
         __input__ (bool): Whether to ask for input interactively
-        __paralellism__ (int): Number of parallel operations
+        __parallelism__ (int): Number of parallel operations, 3 times the number of CPUs by default
         __color__ (bool): Whether to use color in output
         __var_file__ (str): Path to variable definition file
         __version__ (dict): Terraform version information
+        __version_tuple__ (tuple): Terraform (major, minor, patch) version
         __planfile__ (str): Default plan file name
 
     Example:
@@ -50,11 +52,12 @@ class Terraform:
 
     chdir: str
     __version__: Dict
+    __version_tuple__: Tuple[int, int, int]
     __lock__: bool
     __lock_timeout__: str
     __input__: bool
     __workspace__: str
-    __paralellism__: int
+    __parallelism__: int
     __color__: bool
     __var_file__: str
     __planfile__: str
@@ -78,6 +81,20 @@ class Terraform:
         """
         pass
 
+    def __at_least__(self, major: int, minor: int, patch: int = 0) -> bool:
+        """
+        Check whether the Terraform version is at least the given one.
+
+        Args:
+            major (int): Minimum major version
+            minor (int): Minimum minor version
+            patch (int, optional): Minimum patch version. Defaults to 0.
+
+        Returns:
+            bool: True if the Terraform version is greater or equal
+        """
+        pass
+
     def enable_color(self, enable: bool = True):
         """
         Set color output option.
@@ -208,6 +225,7 @@ class Terraform:
         show_output: bool = True,
         callback: Optional[Callable[[Optional[str], Optional[str]], Any]] = None,
         line_callback: Optional[Callable[[Optional[str], Optional[str]], Any]] = None,
+        raw: bool = False,
     ):
         """Run CLI Terraform command
 
@@ -221,13 +239,15 @@ class Terraform:
             show_output (bool, optional): Show command output. Defaults to True.
             callback (Callable(str,str)->Any, optional): Function to handle command output (stdout,stderr). Defaults to None.
             line_callback (Callable(str,str)->Any, optional): Function to handle per line command output. Defaults to None.
+            raw (bool, optional): Keep stdout undecoded in `stdout_bytes` only, without showing it or passing it to the callbacks. Defaults to False.
 
         Returns:
             CommandResult: Result of the command with attributes:
                 - success: Boolean indicating if the command succeeded
-                - stdout: Standard output from the command
+                - stdout: Standard output from the command, empty if raw is True
                 - stderr: Standard error from the command
                 - callback_output: Output from the callback function if provided
+                - stdout_bytes: Undecoded standard output if raw is True
                 - duration: Code runtime duration
 
         Example:
@@ -302,15 +322,23 @@ class Terraform:
         pass
 
     @staticmethod
-    def __parse_vars__(vars: Optional[Dict[str, Any]] = None) -> List[str]:
+    @contextmanager
+    def __parse_vars__(vars: Optional[Dict[str, Any]] = None) -> Iterator[List[str]]:
         """
         Parse variable dictionary into command-line arguments.
 
+        Strings are passed as they are and any other value is encoded as JSON.
+        When there are more than MAX_CLI_VARS variables, they are written to a
+        temporary `.auto.tfvars.json` file and passed with a single
+        `-var-file=<path>` argument instead. The file is removed when the
+        context exits. Terraform rejects undeclared variables given with
+        `-var`, but only warns about the ones in a var file.
+
         Args:
             vars (Dict[str, Any], optional): Dictionary of variable values.
                 Defaults to None.
 
-        Returns:
+        Yields:
             List[str]: List of formatted variable arguments
         """
         pass
@@ -352,7 +380,7 @@ class Terraform:
             lock (bool, optional): Don't hold a state lock during the operation. `-lock=<true|false>` arg. Defaults to None.
             lock_timeout (str, optional): Unless locking is disabled with -lock=false, instructs Terraform to retry acquiring a lock for a period of time before returning an error. `-lock-timeout<int>` arg. Defaults to None.
             color (bool, optional): Enable color output. Defaults to None.
-            parallelism (int, optional): Limit the number of concurrent operations as Terraform walks the graph. `-paralellism=<int>` arg. Defaults to 20.
+            parallelism (int, optional): Limit the number of concurrent operations as Terraform walks the graph. `-parallelism=<int>` arg. Defaults to the instance parallelism (3 times the number of CPUs).
             chdir (str, optional): Directory to run the command at. `-chdir=<path>` arg. Defaults to None.
             state (str, optional): Pass the local state file to plan. `-state=<path>` arg. Defaults to None.
 
@@ -428,7 +456,7 @@ class Terraform:
             lock (bool, optional): Don't hold a state lock during the operation. `-lock=<true|false>` arg. Defaults to None.
             lock_timeout (str, optional): Unless locking is disabled with -lock=false, instructs Terraform to retry acquiring a lock for a period of time before returning an error. `-lock-timeout<int>` arg. Defaults to None.
             color (bool, optional): Enable color output. Defaults to None.
-            parallelism (int, optional): Limit the number of concurrent operations as Terraform walks the graph. `-paralellism=<int>` arg. Defaults to 20.
+            parallelism (int, optional): Limit the number of concurrent operations as Terraform walks the graph. `-parallelism=<int>` arg. Defaults to the instance parallelism (3 times the number of CPUs).
             state (str, optional): Overrides the state filename when reading the prior state snapshot. `-state=<path>` arg. Defaults to None.
             state_out (str, optional):overrides the state filename when writing new state snapshots. `-state-out=<path>` arg. Defaults to None.
             backup (str, optional): Overrides the default filename that the local backend would normally choose dynamically to create backup files when it writes new state. `-backup=<path>` arg. Defaults to None.
@@ -1,6 +1,10 @@
 import re
 
 VERSION_REGEX = re.compile(r"^(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)$")
+JSON_MESSAGE_REGEX = re.compile(r'"@message"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# Above this number of variables, they are passed through a temporary var file
+MAX_CLI_VARS = 8
 
 TERRAFORM_ARGS = {
     "color": "-no-color",
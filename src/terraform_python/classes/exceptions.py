@@ -47,11 +47,14 @@ class TerraformError(Exception):
 
     def format_message(self):
         # Build a detailed error message
-        full_message = self.message + f"\nTerraform command: {self.command}"
+        header = self.message + f"\nTerraform command: {self.command}"
+        if self.cli_command is None and self.duration is None and not self.stderr:
+            return header
+        parts = [header]
         if self.cli_command is not None:
-            full_message += f"\nCLI Call Command: {self.cli_command}"
+            parts.append(f"\nCLI Call Command: {self.cli_command}")
         if self.duration is not None:
-            full_message += f"\nDuration: {self.duration:.4f}s"
+            parts.append(f"\nDuration: {self.duration:.4f}s")
         if self.stderr:
-            full_message += f"\nDetails:\n{self.stderr}"
-        return full_message
+            parts.append(f"\nDetails:\n{self.stderr}")
+        return "".join(parts)
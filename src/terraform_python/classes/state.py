@@ -5,7 +5,6 @@ from typing import Any, Callable, Dict, List, Optional
 from .base import *
 from .exceptions import *
 from ..utils import log
-import shlex
 from uuid import uuid4 as uuid
 import os
 
@@ -34,10 +33,10 @@ class State:
         cmd.append(self.__tf__.__build_arg__("id", id))
         if address:
             if isinstance(address, str):
-                cmd.append(shlex.quote(address))
+                cmd.append(address)
             elif isinstance(address, list):
                 for item in address:
-                    cmd.append(shlex.quote(item))
+                    cmd.append(item)
 
         result = self.__tf__.cmd(cmd, "Terraform state list", chdir=chdir)
 
@@ -73,7 +72,7 @@ class State:
         cmd.append(self.__tf__.__build_arg__("state", state_file))
         cmd.append(self.__tf__.__build_arg__("json", json))
         if address:
-            cmd.append(shlex.quote(address))
+            cmd.append(address)
         result = self.__tf__.cmd(cmd, "Terraform state list", chdir=chdir)
 
         res = TerraformResult(True, result.stdout)
@@ -126,8 +125,8 @@ class State:
             self.__tf__.__build_arg__("ignore_remote_version", ignore_remote_version)
         )
 
-        cmd.append(shlex.quote(src))
-        cmd.append(shlex.quote(dest))
+        cmd.append(src)
+        cmd.append(dest)
 
         result = self.__tf__.cmd(cmd, "Terraform state mv", chdir=chdir)
 
@@ -174,7 +173,7 @@ class State:
             self.__tf__.__build_arg__("ignore_remote_version", ignore_remote_version)
         )
 
-        cmd.append(shlex.quote(address))
+        cmd.append(address)
 
         result = self.__tf__.cmd(cmd, "Terraform state rm", chdir=chdir)
 
@@ -222,8 +221,8 @@ class State:
             self.__tf__.__build_arg__("ignore_remote_version", ignore_remote_version)
         )
 
-        cmd.append(shlex.quote(src_provider))
-        cmd.append(shlex.quote(dest_provider))
+        cmd.append(src_provider)
+        cmd.append(dest_provider)
 
         result = self.__tf__.cmd(cmd, "Terraform state replace-provider", chdir=chdir)
 
@@ -304,7 +303,7 @@ class State:
                     log.info("Created temp state file")
             file_path = filename
 
-        cmd.append(shlex.quote(file_path))
+        cmd.append(file_path)
 
         result = self.__tf__.cmd(cmd, "Terraform state push", chdir=chdir)
 
@@ -2,7 +2,6 @@ from typing import Any, Callable, Dict, List, Optional
 from .base import *
 from .exceptions import *
 from ..utils import log
-import shlex
 
 
 class Workspace:
@@ -79,10 +78,7 @@ class Workspace:
             color = self.__tf__.__color__
         cmd.append(self.__tf__.__build_arg__("color", not color))
         if or_create is True:
-            if (
-                self.__tf__.__version__["version"]["major"] >= 1
-                and self.__tf__.__version__["version"]["minor"] >= 4
-            ):
+            if self.__tf__.__at_least__(1, 4):
                 cmd.append(self.__tf__.__build_arg__("or_create", or_create))
             else:
                 existing = self.list(True, color=color, chdir=chdir).result
@@ -94,7 +90,7 @@ class Workspace:
                             "Using alternate method",
                         )
                     return self.new(workspace, color=color, chdir=chdir)
-        cmd.append(shlex.quote(workspace))
+        cmd.append(workspace)
 
         result = self.__tf__.cmd(
             cmd, "Terraform workspace select", chdir=chdir, show_output=not quiet
@@ -145,7 +141,7 @@ class Workspace:
         cmd.append(self.__tf__.__build_arg__("lock_timeout", lock_timeout))
         cmd.append(self.__tf__.__build_arg__("state", state))
 
-        cmd.append(shlex.quote(workspace))
+        cmd.append(workspace)
 
         result = self.__tf__.cmd(cmd, "Terraform workspace new", chdir=chdir)
 
@@ -1,20 +1,46 @@
+import io
 import json as _json
 import os
-import re
-import shlex
-from typing import Any, Callable, Dict, List, Optional
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from .utils import cmd_to_array, log, run_command, clean_command
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 from .classes import *  # noqa  # isort:skip
 
 os.environ["TF_IN_AUTOMATION"] = "1"
+# Share downloaded provider plugins between working directories and runs
+if "TF_PLUGIN_CACHE_DIR" not in os.environ:
+    try:
+        __plugin_cache_dir__ = os.path.expanduser("~/.terraform.d/plugin-cache")
+        os.makedirs(__plugin_cache_dir__, exist_ok=True)
+        os.environ["TF_PLUGIN_CACHE_DIR"] = __plugin_cache_dir__
+    except OSError:
+        pass
 # os.environ['TF_LOG'] = 'trace'
 log.set_env("Terraform")
 log.show_file(False)
 log.set_level("info")
 
 
+def __remove_file__(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def __var_value__(value: Any) -> str:
+    # Same encoding as the var file: strings as they are, the rest as JSON
+    if isinstance(value, str):
+        return value
+    return _json.dumps(value, default=str)
+
+
 class Terraform:
 
     def __init__(
@@ -24,7 +50,7 @@ class Terraform:
         lock: Optional[bool] = True,
         lock_timeout: Optional[str] = "0s",
         input: Optional[bool] = False,
-        parallelism: Optional[int] = 10,
+        parallelism: Optional[int] = None,
         color: Optional[bool] = True,
         var_file: Optional[str] = None,
     ):
@@ -33,10 +59,13 @@ class Terraform:
         self.__lock__ = lock
         self.__lock_timeout__ = lock_timeout
         self.__input__ = input
-        self.__paralellism__ = parallelism
+        if parallelism is None:
+            parallelism = 3 * (os.cpu_count() or 4)
+        self.__parallelism__ = parallelism
         self.__color__ = color
         self.__var_file__ = var_file
         self.__version__ = {}
+        self.__version_tuple__ = (0, 0, 0)
         self.__planfile__ = "plan.tfplan"
         self.state = State(self)
         self.workspace = Workspace(self)
@@ -68,11 +97,9 @@ class Terraform:
         version = _json.loads(result.stdout)
         version_str = version["terraform_version"]
 
-        version_dict = VERSION_REGEX.match(version_str)
-        if version_dict:
-            version_dict = version_dict.groupdict()
-            for key in version_dict.keys():
-                version_dict[key] = int(version_dict[key])
+        match = VERSION_REGEX.match(version_str)
+        if match:
+            version_dict = {key: int(value) for key, value in match.groupdict().items()}
         else:
             version_dict = dict(major=0, minor=0, patch=0)
         res = {
@@ -82,6 +109,11 @@ class Terraform:
             "platform": version["platform"],
         }
         self.__version__ = res
+        self.__version_tuple__ = (
+            version_dict["major"],
+            version_dict["minor"],
+            version_dict["patch"],
+        )
         if not quiet:
             log.success(
                 f"Terraform version retrieved successfully in {result.duration}s",
@@ -89,6 +121,9 @@ class Terraform:
             )
         return TerraformResult(True, res)
 
+    def __at_least__(self, major: int, minor: int, patch: int = 0) -> bool:
+        return self.__version_tuple__ >= (major, minor, patch)
+
     def enable_color(self, enable: bool = True):
         self.__color__ = enable
 
@@ -110,7 +145,7 @@ class Terraform:
             elif isinstance(value, str) and len(value) == 0:
                 return ""
             elif value is not None and len(str(value)) > 0:
-                res += shlex.quote(str(value))
+                res += str(value)
 
         elif isinstance(value, bool):
             return res if value else ""
@@ -131,20 +166,20 @@ class Terraform:
             args.append(Terraform.__build_arg__("color", not color))
         elif self.__color__ is False:
             args.append(TERRAFORM_ARGS["color"])
-        if lock is not None and lock is False:
+        if lock is None:
+            lock = self.__lock__
+        if lock is False:
             args.append(Terraform.__build_arg__("lock", lock))
-        elif self.__lock__ is False:
-            args.append(Terraform.__build_arg__("lock", self.__lock__))
 
         if lock_timeout is not None and lock_timeout != "0s":
             args.append(Terraform.__build_arg__("lock_timeout", lock_timeout))
         elif self.__lock_timeout__ != "0s":
             args.append(Terraform.__build_arg__("lock_timeout", self.__lock_timeout__))
 
-        if input is not None:
+        if input is None:
+            input = self.__input__
+        if input is False:
             args.append(Terraform.__build_arg__("input", input))
-        elif self.__input__ is False:
-            args.append(Terraform.__build_arg__("input", self.__input__))
         return args
 
     def __global_args__(self, chdir: str = None):
@@ -183,6 +218,7 @@ class Terraform:
         show_output: bool = True,
         callback: Optional[Callable[[Optional[str], Optional[str]], Any]] = None,
         line_callback: Optional[Callable[[Optional[str], Optional[str]], Any]] = None,
+        raw: bool = False,
     ):
         if not chdir:
             chdir = self.chdir
@@ -194,6 +230,7 @@ class Terraform:
             show_output=show_output,
             callback=callback,
             line_callback=line_callback,
+            raw=raw,
         )
 
     def init(
@@ -224,20 +261,23 @@ class Terraform:
             )
         )
 
-        cmd.append(Terraform.__build_arg__("upgrade", upgrade))
-        cmd.append(Terraform.__build_arg__("reconfigure", reconfigure))
-        cmd.append(Terraform.__build_arg__("migrate_state", migrate_state))
-        cmd.append(Terraform.__build_arg__("force_copy", force_copy))
-        cmd.append(Terraform.__build_arg__("backend_config", backend_config))
-        cmd.append(Terraform.__build_arg__("plugin_dir", plugin_dir))
-        # cmd.append(Terraform.__build_arg__("lockfile", lockfile))
-
+        build_arg = Terraform.__build_arg__
+        flags = [
+            build_arg("upgrade", upgrade),
+            build_arg("reconfigure", reconfigure),
+            build_arg("migrate_state", migrate_state),
+            build_arg("force_copy", force_copy),
+            build_arg("backend_config", backend_config),
+            build_arg("plugin_dir", plugin_dir),
+            # build_arg("lockfile", lockfile),
+        ]
         if not backend:
-            cmd.append(Terraform.__build_arg__("backend", backend))
+            flags.append(build_arg("backend", backend))
         if not get:
-            cmd.append(Terraform.__build_arg__("get", get))
+            flags.append(build_arg("get", get))
         if not get_plugins:
-            cmd.append(Terraform.__build_arg__("get_plugins", get_plugins))
+            flags.append(build_arg("get_plugins", get_plugins))
+        cmd.extend(flag for flag in flags if flag)
 
         result = self.cmd(cmd, title="Terraform init", chdir=chdir)
         if not result.success:
@@ -286,24 +326,27 @@ class Terraform:
         return TerraformResult(True, result.stdout)
 
     @staticmethod
-    def __parse_vars__(vars: Optional[Dict[str, Any]] = None) -> List[str]:
+    @contextmanager
+    def __parse_vars__(vars: Optional[Dict[str, Any]] = None) -> Iterator[List[str]]:
         if not vars:
-            return []
-        args = []
-        for key in vars.keys():
-            value = vars[key]
-            if isinstance(value, str):
-                value = re.sub(r"\"", '\\"', value)
-                value = f'"{value}"'
-            elif (
-                isinstance(value, dict)
-                or isinstance(value, list)
-                or isinstance(value, tuple)
-            ):
-                value = _json.dumps(value)
-            args.append("-var")
-            args.append(f"{key}={value}")
-        return args
+            yield []
+            return
+        if len(vars) <= MAX_CLI_VARS:
+            args = []
+            for key, value in vars.items():
+                args.append("-var")
+                args.append(f"{key}={__var_value__(value)}")
+            yield args
+            return
+        # Unlike -var, terraform only warns about undeclared variables here
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".auto.tfvars.json", delete=False, encoding="utf-8"
+        ) as file:
+            _json.dump(vars, file, default=str)
+        try:
+            yield [Terraform.__build_arg__("var_file", file.name)]
+        finally:
+            __remove_file__(file.name)
 
     def plan(
         self,
@@ -335,39 +378,37 @@ class Terraform:
             out = self.__planfile__
         cmd.append(Terraform.__build_arg__("out", out))
 
-        if (
-            self.__version__["version"]["major"] >= 1
-            and self.__version__["version"]["minor"] >= 0
-        ):
+        if self.__at_least__(1, 1):
             cmd.append(Terraform.__build_arg__("refresh_only", refresh_only))
-        else:
+        elif refresh_only:
             log.warn(
                 f"the option '-refresh-only' is supported since the version 1.1.0, and your version is {self.__version__['version_str']}"
             )
-        if (
-            self.__version__["version"]["major"] >= 1
-            and self.__version__["version"]["minor"] >= 0
-        ):
+        if self.__at_least__(1, 0):
             cmd.append(Terraform.__build_arg__("json", json))
-        else:
+        elif json:
             log.warn(
                 f"the option '-json' is supported since the version 1.0.0, and your version is {self.__version__['version_str']}"
             )
         if not parallelism:
-            parallelism = self.__paralellism__
+            parallelism = self.__parallelism__
         cmd.append(Terraform.__build_arg__("parallelism", parallelism))
 
-        cmd.append(Terraform.__build_arg__("destroy", destroy))
-        cmd.append(Terraform.__build_arg__("refresh", refresh))
-        cmd.append(Terraform.__build_arg__("replace", replace))
-        cmd.append(Terraform.__build_arg__("target", target))
-        cmd.append(Terraform.__build_arg__("var_file", var_file))
-        cmd.append(Terraform.__build_arg__("state", state))
-        cmd.append(Terraform.__build_arg__("compact_warnings", compact_warnings))
-
-        cmd.extend(Terraform.__parse_vars__(vars))
-
-        result = self.cmd(cmd, title="Terraform plan", chdir=chdir)
+        build_arg = Terraform.__build_arg__
+        flags = [
+            build_arg("destroy", destroy),
+            build_arg("refresh", refresh) if refresh is False else "",
+            build_arg("replace", replace),
+            build_arg("target", target),
+            build_arg("var_file", var_file),
+            build_arg("state", state),
+            build_arg("compact_warnings", compact_warnings),
+        ]
+        cmd.extend(flag for flag in flags if flag)
+
+        with Terraform.__parse_vars__(vars) as var_args:
+            cmd.extend(var_args)
+            result = self.cmd(cmd, title="Terraform plan", chdir=chdir)
         if not result.success:
             log.failed(
                 f"Terraform plan failed in: {result.duration} seconds", end_sub=True
@@ -389,15 +430,23 @@ class Terraform:
     @staticmethod
     def __apply_line_callback__(stdout: str = None, stderr: str = None):
         if stdout:
-            stdout = _json.loads(stdout)
-            log.info(stdout["@message"])
+            match = JSON_MESSAGE_REGEX.search(stdout)
+            if match:
+                message = match.group(1)
+                if "\\" in message:
+                    message = _json.loads(f'"{message}"')
+            elif orjson is not None:
+                message = orjson.loads(stdout)["@message"]
+            else:
+                message = _json.loads(stdout)["@message"]
+            log.info(message)
 
     @staticmethod
     def __apply_callback__(stdout: str = None, stderr: str = None):
         result = {}
-        for line in stdout.splitlines():
+        for line in io.StringIO(stdout):
             try:
-                line = _json.loads(line)
+                line = _json.loads(line.rstrip("\n"))
                 if line["type"] == "outputs":
                     result["outputs"] = line["outputs"]
                 elif line["type"] == "change_summary":
@@ -445,50 +494,55 @@ class Terraform:
         callback = None
         line_callback = None
 
-        if self.__version__["version"]["major"] >= 1:
+        if self.__at_least__(1, 0):
             cmd.append(Terraform.__build_arg__("json", json))
             if json:
                 line_callback = Terraform.__apply_line_callback__
                 callback = Terraform.__apply_callback__
 
         if not parallelism:
-            cmd.append(Terraform.__build_arg__("parallelism", self.__paralellism__))
+            cmd.append(Terraform.__build_arg__("parallelism", self.__parallelism__))
         else:
             cmd.append(Terraform.__build_arg__("parallelism", parallelism))
-        cmd.append(Terraform.__build_arg__("auto_approve", auto_approve))
-        cmd.append(Terraform.__build_arg__("compact_warnings", compact_warnings))
-
-        cmd.append(Terraform.__build_arg__("state", state))
-        cmd.append(Terraform.__build_arg__("state_out", state_out))
-        cmd.append(Terraform.__build_arg__("backup", backup))
-        cmd.append(Terraform.__build_arg__("var_file", var_file))
-        cmd.extend(Terraform.__parse_vars__(vars))
-
-        cmd.append(Terraform.__build_arg__("destroy", destroy))
-        cmd.append(Terraform.__build_arg__("refresh", refresh))
-        cmd.append(Terraform.__build_arg__("replace", replace))
-        cmd.append(Terraform.__build_arg__("target", target))
-        if (
-            self.__version__["version"]["major"] >= 1
-            and self.__version__["version"]["minor"] >= 0
-        ):
+        build_arg = Terraform.__build_arg__
+        flags = [
+            build_arg("auto_approve", auto_approve),
+            build_arg("compact_warnings", compact_warnings),
+            build_arg("state", state),
+            build_arg("state_out", state_out),
+            build_arg("backup", backup),
+            build_arg("var_file", var_file),
+        ]
+        cmd.extend(flag for flag in flags if flag)
+
+        flags = [
+            build_arg("destroy", destroy),
+            build_arg("refresh", refresh) if refresh is False else "",
+            build_arg("replace", replace),
+            build_arg("target", target),
+        ]
+        cmd.extend(flag for flag in flags if flag)
+        if self.__at_least__(1, 1):
             cmd.append(Terraform.__build_arg__("refresh_only", refresh_only))
-        else:
+        elif refresh_only:
             log.warn(
                 f"the option '-refresh-only' is supported since the version 1.1.0, and your version is {self.__version__['version_str']}"
             )
         if not plan_file:
-            cmd.append(shlex.quote(self.__planfile__))
+            cmd.append(self.__planfile__)
         else:
-            cmd.append(shlex.quote(plan_file))
-        result = self.cmd(
-            cmd,
-            title="Terraform apply",
-            chdir=chdir,
-            line_callback=line_callback,
-            callback=callback,
-            show_output=not (json and self.__version__["version"]["major"] >= 1),
-        )
+            cmd.append(plan_file)
+        with Terraform.__parse_vars__(vars) as var_args:
+            # Options go before the plan file argument
+            cmd[-1:-1] = var_args
+            result = self.cmd(
+                cmd,
+                title="Terraform apply",
+                chdir=chdir,
+                line_callback=line_callback,
+                callback=callback,
+                show_output=not (json and self.__at_least__(1, 0)),
+            )
         res = TerraformResult(True, result.stdout)
         if not result.success:
             log.failed(
@@ -504,7 +558,7 @@ class Terraform:
         log.success(
             f"Terraform apply completed in: {result.duration} seconds", end_sub=True
         )
-        if json and self.__version__["version"]["major"] >= 1:
+        if json and self.__at_least__(1, 0):
             res.result = dict(stdout=result.stdout, output=result.callback_output)
         return res
 
@@ -530,7 +584,7 @@ class Terraform:
         )
 
         if not parallelism:
-            cmd.append(Terraform.__build_arg__("parallelism", self.__paralellism__))
+            cmd.append(Terraform.__build_arg__("parallelism", self.__parallelism__))
         else:
             cmd.append(Terraform.__build_arg__("parallelism", parallelism))
 
@@ -538,9 +592,9 @@ class Terraform:
         cmd.append(Terraform.__build_arg__("target", target))
         cmd.append(Terraform.__build_arg__("var_file", var_file))
 
-        cmd.extend(self.__parse_vars__(vars))
-
-        result = self.cmd(cmd, title="Terraform destroy", chdir=chdir)
+        with Terraform.__parse_vars__(vars) as var_args:
+            cmd.extend(var_args)
+            result = self.cmd(cmd, title="Terraform destroy", chdir=chdir)
         if not result.success:
             log.failed(
                 f"Terraform destroy failed in: {result.duration} seconds",
@@ -571,11 +625,13 @@ class Terraform:
             cmd.append(Terraform.__build_arg__("color", not self.__color__))
 
         if not file:
-            cmd.append(shlex.quote(self.__planfile__))
+            cmd.append(self.__planfile__)
         else:
-            cmd.append(shlex.quote(file))
+            cmd.append(file)
 
-        result = self.cmd(cmd, title="Terraform show", chdir=chdir, show_output=True)
+        result = self.cmd(
+            cmd, title="Terraform show", chdir=chdir, show_output=True, raw=json
+        )
         res = TerraformResult(True, result.stdout)
         if not result.success:
             log.failed(
@@ -593,13 +649,16 @@ class Terraform:
             f"Terraform show completed in: {result.duration} seconds", end_sub=True
         )
         if json:
-            res.result = _json.loads(result.stdout)
+            if orjson is not None:
+                res.result = orjson.loads(result.stdout_bytes)
+            else:
+                res.result = _json.loads(result.stdout_bytes)
         return res
 
     def login(self, hostname: str = None, chdir: str = None):
         cmd = ["login"]
         if hostname:
-            cmd.append(shlex.quote(hostname))
+            cmd.append(hostname)
 
         result = self.cmd(cmd, title="Terraform login", chdir=chdir)
         res = TerraformResult(True, result.stdout)
@@ -622,7 +681,7 @@ class Terraform:
     def logout(self, hostname: str = None, chdir: str = None):
         cmd = ["logout"]
         if hostname:
-            cmd.append(shlex.quote(hostname))
+            cmd.append(hostname)
 
         result = self.cmd(cmd, title="Terraform logout", chdir=chdir)
         res = TerraformResult(True, result.stdout)
@@ -753,7 +812,7 @@ class Terraform:
         cmd.append(Terraform.__build_arg__("raw", raw))
         cmd.append(Terraform.__build_arg__("state", state))
         if output_name:
-            cmd.append(shlex.quote(output_name))
+            cmd.append(output_name)
         result = self.cmd(cmd, "Terraform output", chdir, show_output=not json)
         res = TerraformResult(True, result.stdout)
         if not result.success:
@@ -831,18 +890,17 @@ class Terraform:
         )
 
         cmd.append(Terraform.__build_arg__("config", config))
-        cmd.append(Terraform.__build_arg__("paralellism", parallelism))
+        cmd.append(Terraform.__build_arg__("parallelism", parallelism))
         cmd.append(Terraform.__build_arg__("provider", provider))
         cmd.append(Terraform.__build_arg__("var_file", var_file))
         cmd.append(Terraform.__build_arg__("state", state))
         cmd.append(Terraform.__build_arg__("state_out", state_out))
         cmd.append(Terraform.__build_arg__("backup", backup))
-        cmd.extend(Terraform.__parse_vars__(vars))
-
-        cmd.append(shlex.quote(address))
-        cmd.append(shlex.quote(id))
-
-        result = self.cmd(cmd, "Terraform import", chdir)
+        with Terraform.__parse_vars__(vars) as var_args:
+            cmd.extend(var_args)
+            cmd.append(address)
+            cmd.append(id)
+            result = self.cmd(cmd, "Terraform import", chdir)
         res = TerraformResult(True, result.stdout)
         if not result.success:
             log.failed(f"Terraform import failed in {result.duration}s", end_sub=True)
@@ -879,7 +937,7 @@ class Terraform:
             )
         )
         if not parallelism:
-            cmd.append(Terraform.__build_arg__("parallelism", self.__paralellism__))
+            cmd.append(Terraform.__build_arg__("parallelism", self.__parallelism__))
         else:
             cmd.append(Terraform.__build_arg__("parallelism", parallelism))
         cmd.append(Terraform.__build_arg__("target", target))
@@ -889,9 +947,9 @@ class Terraform:
         cmd.append(Terraform.__build_arg__("state_out", state_out))
         cmd.append(Terraform.__build_arg__("backup", backup))
         cmd.append(Terraform.__build_arg__("var_file", var_file))
-        cmd.extend(Terraform.__parse_vars__(vars))
-
-        result = self.cmd(cmd, "Terraform refresh", chdir)
+        with Terraform.__parse_vars__(vars) as var_args:
+            cmd.extend(var_args)
+            result = self.cmd(cmd, "Terraform refresh", chdir)
         res = TerraformResult(True, result.stdout)
         if not result.success:
             log.failed(f"Terraform refresh failed in {result.duration}s", end_sub=True)
@@ -922,10 +980,7 @@ class Terraform:
         backup: Optional[str] = None,
         chdir: Optional[str] = None,
     ):
-        if self.__version__["version"]["major"] == 0 or (
-            self.__version__["version"]["major"] >= 1
-            and self.__version__["version"]["minor"] < 1
-        ):
+        if not self.__at_least__(1, 1):
             return self.__legacy_refresh__(
                 target=target,
                 vars=vars,
@@ -994,7 +1049,7 @@ class Terraform:
         cmd.append(Terraform.__build_arg__("state", state))
         cmd.append(Terraform.__build_arg__("state_out", state_out))
         cmd.append(Terraform.__build_arg__("allow_missing", allow_missing))
-        cmd.append(shlex.quote(address))
+        cmd.append(address)
 
         result = self.cmd(cmd, "Terraform taint", chdir)
         res = TerraformResult(True, result.stdout)
@@ -1104,7 +1159,7 @@ class Terraform:
         cmd.append(Terraform.__build_arg__("state", state))
         cmd.append(Terraform.__build_arg__("state_out", state_out))
         cmd.append(Terraform.__build_arg__("allow_missing", allow_missing))
-        cmd.append(shlex.quote(address))
+        cmd.append(address)
 
         result = self.cmd(cmd, "Terraform untaint", chdir)
         res = TerraformResult(True, result.stdout)
@@ -1128,7 +1183,7 @@ class Terraform:
 
         if not chdir:
             chdir = self.chdir
-        cmd.append(shlex.quote(lock_id))
+        cmd.append(lock_id)
 
         result = self.cmd(cmd, "Terraform force-unlock", chdir=chdir)
         res = TerraformResult(True, result.stdout)
@@ -1,16 +1,23 @@
 import traceback
 import atexit
-import datetime
-import inspect
+import collections
+import itertools
 import json
 import logging
 import logging.handlers
+import queue
 import shutil
+import signal
 import sys
 import os
-from queue import Queue
-from threading import Event, Thread
-from time import time
+from threading import Condition, Event, Thread
+from time import monotonic, time
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 # ANSI escape codes for colors and styles (cross-platform)
 from .colors import color
@@ -32,8 +39,8 @@ def __catcher__(type, value, tback):
                     logger.exception(ln, _raise=False)
             for line in str(value).splitlines():
                 logger.exception(line, _raise=False)
-            for task in logger.__tasks__:
-                logger.finish(task["id"], success=False)
+            for task in list(logger.__tasks__.values()):
+                logger.finish(task.id, success=False)
     else:
         sys.__excepthook__(type, value, tback)
 
@@ -55,6 +62,12 @@ LOGGER_LEVEL_COLORS = {
     "EXCEPTION": color.bold(color.bg_red("EXCEP")),
 }
 
+# Escape codes used for every formatted line, bound once at import
+__BOLD__ = color.BOLD
+__GREEN__ = color.GREEN
+__RED__ = color.RED
+__END__ = color.END
+
 # Map custom levels to standard logging levels (and define custom levels)
 LOGGER_LEVELS = {
     "TRACE": logging.DEBUG - 1,  # Below DEBUG
@@ -82,6 +95,42 @@ logging.addLevelName(LOGGER_LEVELS["COMPLETED"], "COMPLETED")
 logging.addLevelName(LOGGER_LEVELS["DONE"], "DONE")
 logging.addLevelName(LOGGER_LEVELS["SEP"], "SEP")
 
+# Level numbers bound once for the per-call level checks
+__LEVEL_TRACE__ = LOGGER_LEVELS["TRACE"]
+__LEVEL_DEBUG__ = LOGGER_LEVELS["DEBUG"]
+__LEVEL_INFO__ = LOGGER_LEVELS["INFO"]
+__LEVEL_DONE__ = LOGGER_LEVELS["DONE"]
+__LEVEL_RUNNING__ = LOGGER_LEVELS["RUNNING"]
+__LEVEL_FAILED__ = LOGGER_LEVELS["FAILED"]
+__LEVEL_COMPLETED__ = LOGGER_LEVELS["COMPLETED"]
+__LEVEL_SUCCESS__ = LOGGER_LEVELS["SUCCESS"]
+__LEVEL_WARNING__ = LOGGER_LEVELS["WARNING"]
+__LEVEL_ERROR__ = LOGGER_LEVELS["ERROR"]
+__LEVEL_CRITICAL__ = LOGGER_LEVELS["CRITICAL"]
+__LEVEL_SEP__ = LOGGER_LEVELS["SEP"]
+__LEVEL_EXCEPTION__ = LOGGER_LEVELS["EXCEPTION"]
+
+
+def __dumps__(obj) -> str:
+    """Serializes a dict or list log argument to JSON, with orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # Non string keys or unsupported types, json handles or reports them
+            pass
+    return json.dumps(obj)
+
+
+def __to_text__(msg) -> str:
+    """Converts a log argument to text, dicts and lists are serialized to JSON."""
+    cls = type(msg)
+    if cls is str:
+        return msg
+    if cls is dict or cls is list or isinstance(msg, (dict, list)):
+        return __dumps__(msg)
+    return str(msg)
+
 
 def format_elapsed_time(start_time: float, end_time: float) -> str:
     """Function to format elapsed time in <h>h, <m>m, <s>s, <ms>ms
@@ -94,26 +143,180 @@ def format_elapsed_time(start_time: float, end_time: float) -> str:
         str: Formatted elapsed time
     """
     elapsed_time = end_time - start_time
-    result = ""
-    hours = int(elapsed_time // 3600)
-    if hours > 0:
-        result += f"{hours}h, "
-    elapsed_time %= 3600
-    minutes = int(elapsed_time // 60)
-    if minutes > 0:
-        result += f"{minutes}min, "
-    elapsed_time %= 60
-    seconds = int(elapsed_time)
-    if seconds > 0:
-        result += f"{seconds}s, "
-    milliseconds = int((elapsed_time - int(elapsed_time)) * 1000)
-    if milliseconds > 0:
-        result += f"{milliseconds}ms"
-    return result.rstrip(", ")  # Remove trailing comma and space
-
-
-class LoggerFormatter:
-    pass
+    if elapsed_time < 1:
+        # Most animation frames and short tasks land here
+        return f"{max(int(elapsed_time * 1000), 0)}ms"
+    seconds, milliseconds = divmod(int(elapsed_time * 1000), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    parts = []
+    if hours:
+        parts.append(f"{hours}h")
+    if minutes:
+        parts.append(f"{minutes}min")
+    if seconds:
+        parts.append(f"{seconds}s")
+    if milliseconds:
+        parts.append(f"{milliseconds}ms")
+    return ", ".join(parts)
+
+
+class BackgroundTask:
+    """State of a task started with `Logger.start`."""
+
+    __slots__ = (
+        "id",
+        "message",
+        "start_time",
+        "location",
+        "end_time",
+        "success",
+        "postfix",
+        "result_message",
+    )
+
+    def __init__(self, id: str, message: str, start_time: float, location: tuple):
+        self.id = id
+        self.message = message
+        self.start_time = start_time
+        self.location = location
+        self.end_time: Optional[float] = None
+        self.success = True
+        self.postfix = ""
+        self.result_message = ""
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that batches the writes in a bigger buffer.
+
+    The stream is flushed right away for records at WARNING or above, and
+    at most every `flush_interval` seconds for the rest. The file size is
+    tracked with a counter instead of seeking the stream, which would flush
+    the buffer on every record.
+    """
+
+    def __init__(
+        self, *args, buffer_size: int = 65536, flush_interval: float = 1.0, **kwargs
+    ):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.__last_flush__ = monotonic()
+        self.__defer_flush__ = False
+        self.__size__ = 0
+        self.__record_size__ = 0
+        self.__rotatable__ = True
+        super().__init__(*args, **kwargs)
+
+    def _open(self):
+        stream = open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=getattr(self, "errors", None),
+        )
+        # Nothing is buffered yet, so this doesn't cost a flush
+        self.__size__ = stream.seek(0, os.SEEK_END)
+        self.__rotatable__ = os.path.isfile(self.baseFilename)
+        return stream
+
+    def shouldRollover(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes <= 0 or not self.__rotatable__:
+            return False
+        # maxBytes is in bytes, non-ASCII characters take more than one
+        msg = self.format(record) + self.terminator
+        self.__record_size__ = len(msg.encode(self.stream.encoding, self.stream.errors))
+        return self.__size__ + self.__record_size__ >= self.maxBytes
+
+    def emit(self, record):
+        self.__defer_flush__ = (
+            record.levelno < logging.WARNING
+            and monotonic() - self.__last_flush__ < self.flush_interval
+        )
+        try:
+            super().emit(record)
+            self.__size__ += self.__record_size__
+        finally:
+            self.__record_size__ = 0
+            self.__defer_flush__ = False
+
+    def flush(self):
+        if self.__defer_flush__:
+            return
+        self.__last_flush__ = monotonic()
+        super().flush()
+
+    def flush_if_due(self):
+        """Flushes the buffered records once `flush_interval` has elapsed."""
+        if monotonic() - self.__last_flush__ >= self.flush_interval:
+            self.flush()
+
+
+class BatchedStreamHandler(logging.StreamHandler):
+    """Stream handler that joins the records queued together into one write.
+
+    Records are buffered until `flush` is called, which `BatchingQueueListener`
+    does whenever its queue is drained, or until `max_batch` records are
+    buffered.
+    """
+
+    def __init__(self, stream=None, max_batch: int = 64):
+        super().__init__(stream)
+        self.__buffer__: List[str] = []
+        self.max_batch = max_batch
+
+    def emit(self, record):
+        try:
+            self.__buffer__.append(self.format(record) + self.terminator)
+            if len(self.__buffer__) >= self.max_batch:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.__buffer__ and self.stream:
+                # Drop the batch before writing so a failed write isn't retried
+                data = "".join(self.__buffer__)
+                records = len(self.__buffer__)
+                self.__buffer__.clear()
+                try:
+                    self.stream.write(data)
+                    super().flush()
+                except RecursionError:
+                    raise
+                except Exception:
+                    # Reported like StreamHandler.emit does, so a closed console
+                    # doesn't stop the queue listener thread
+                    self.handleError(
+                        logging.makeLogRecord(
+                            {"msg": "%d batched records", "args": (records,)}
+                        )
+                    )
+            else:
+                super().flush()
+        finally:
+            self.release()
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """Queue listener that flushes its batched handlers once the queue is drained.
+
+    The check doesn't depend on which handler the next queued records are
+    for, so a record only some handlers receive never holds back the others.
+    """
+
+    def handle(self, record):
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                if isinstance(handler, BatchedStreamHandler):
+                    handler.flush()
 
 
 class LoggerFormatter(logging.Formatter):
@@ -135,12 +338,12 @@ class LoggerFormatter(logging.Formatter):
 
     def __init__(
         self,
-        fmt: str = None,
-        datefmt: str = None,
+        fmt: Optional[str] = None,
+        datefmt: str = "%Y-%m-%dT%H:%M:%S",
         style="%",
         validate=True,
         colors=True,
-        old: LoggerFormatter = None,
+        old: Optional["LoggerFormatter"] = None,
         **args,
     ):
         """
@@ -148,7 +351,7 @@ class LoggerFormatter(logging.Formatter):
 
         Args:
             fmt: Log message format string. If None, custom formatting is applied.
-            datefmt: Date format string for timestamps. If None, ISO format is used.
+            datefmt: Date format string for timestamps, milliseconds are always appended.
             style: Style of the fmt string ('%', '{', or '$').
             validate: Whether to validate the format string.
             colors: Whether to use colored output in log messages.
@@ -166,189 +369,239 @@ class LoggerFormatter(logging.Formatter):
         self.colors = colors
         self.fmt = fmt
         self.__proc_level__ = 0
+        self.__last_running__ = False
         if old:
             self.__proc_level__ = old.__proc_level__
+            self.__last_running__ = old.__last_running__
         self.__start_proc_prefix__ = "\u256d○ "
         self.__end_proc_prefix__ = "\u2570● "
         self.__subproc_prefix__ = "│ "
+        self.__prefix_tpl__ = self.__build_prefix_tpl__()
+        # Records logged within the same second share the formatted date
+        self.__date_cache__: Tuple[Optional[int], str] = (None, "")
+        # Pick the formatting path once instead of branching on every record
+        self.__formatter__: Callable[[logging.LogRecord], str]
+        if fmt:
+            self.__formatter__ = super().format
+        elif colors:
+            self.__formatter__ = self.__format_colored__
+        else:
+            self.__formatter__ = self.__format_plain__
+
+    def format(self, record):
+        """
+        Format the specified record as text.
+
+        Args:
+            record: The log record to format
+
+        Returns:
+            str: The formatted log message
+        """
+        return self.__formatter__(record)
+
+    def __build_prefix_tpl__(self) -> str:
+        """Builds the %-style template of the line prefix for the enabled sections."""
+        prefix = []
+        if self.colors:
+            if self._show_date:
+                prefix.append(color.dark_blue("%(asctime)s"))
+            if self._show_env:
+                prefix.append(color.purple("(%(env)s)"))
+            if self._show_level:
+                prefix.append("%(levelcolor)s")
+            if self._show_file:
+                prefix.append(
+                    f"{color.dark_green('%(filename)s')}{color.orange(':')}{color.dark_green('%(lineno)d')}"
+                )
+        else:
+            if self._show_date:
+                prefix.append("%(asctime)s")
+            if self._show_env:
+                prefix.append("(%(env)s)")
+            if self._show_level:
+                prefix.append("%(levelname)-9s")
+            if self._show_file:
+                prefix.append("%(filename)s:%(lineno)d")
+        return " ".join(prefix)
+
+    def __format_timestamp__(self, record) -> str:
+        """Formats the record creation time with `datefmt` and milliseconds."""
+        second = int(record.created)
+        if self.__date_cache__[0] != second:
+            self.__date_cache__ = (second, self.formatTime(record, self.datefmt))
+        return f"{self.__date_cache__[1]}.{int(record.msecs):03d}"
 
     def __process_line_fmt__(self, line: str, bold: bool, success: bool, fail: bool):
         if bold:
-            line = color.bold(line)
+            line = f"{__BOLD__}{line}{__END__}"
         if success:
-            line = color.green(line)
+            line = f"{__GREEN__}{line}{__END__}"
         elif fail:
-            line = color.red(line)
+            line = f"{__RED__}{line}{__END__}"
         return line
 
-    def format(self, record):
+    def __format_plain__(self, record) -> str:
         """
-        Format the specified record as text.
+        Format the specified record as plain text.
 
         Args:
             record: The log record to format
 
         Returns:
             str: The formatted log message
+        """
+        msg = record.getMessage()
+        levelname = record.levelname
+        if levelname == "SEP":
+            return msg.replace("─", "-")
+        if getattr(record, "raw", False):
+            return msg
 
-        Raises:
-            KeyError: If required keys are missing from record.args
+        record.asctime = self.__format_timestamp__(record)
+        prefix = self.__prefix_tpl__ % {
+            "asctime": record.asctime,
+            "env": getattr(record, "env", "default"),
+            "levelname": levelname,
+            "filename": record.filename,
+            "lineno": record.lineno,
+        }
+        return f"{prefix} | {msg}"
+
+    def __format_colored__(self, record) -> str:
         """
-        if self.fmt:
-            return super().format(record)
-        msg = record.msg
+        Format the specified record as colored text.
 
-        if record.levelname == "SEP":
-            return msg if self.colors else msg.replace("─", "-")
-        prefix = []
-        # Safely access record arguments with defaults
-        args = getattr(record, "args", {})
-        if not isinstance(args, dict):
-            args = {}
-
-        env = args.get("env", "default")
-        raw = args.get("raw", False)
-        if raw:
-            return msg
+        Args:
+            record: The log record to format
 
-        timestamp = args.get(
-            "timestamp", datetime.datetime.now().isoformat(timespec="milliseconds")
-        )
+        Returns:
+            str: The formatted log message
+        """
+        msg = record.getMessage()
+        levelname = record.levelname
 
         # Handle line continuation
         delete_last = ""
-        if not args.get("last_log", True) and args.get("started", False):
+        if self.__last_running__:
             delete_last = "\033[A\033[K"  # Move up one line and clear it
+        self.__last_running__ = levelname == "RUNNING"
 
-        lines = []
-        if self.colors:
-            proc_prefix = self.__subproc_prefix__ * self.__proc_level__
-            end_proc = args.get("end_proc", False)
-            start_proc = args.get("start_proc", False)
-            bold = args.get("bold", False)
-            success = record.levelname == "SUCCESS"
-            fail = record.levelname == "FAILED"
-
-            if end_proc and self.__proc_level__ <= 0:
-                end_proc = False
+        if levelname == "SEP":
+            return msg
+        if getattr(record, "raw", False):
+            return msg
+
+        level_colors = LOGGER_LEVEL_COLORS
+        record.asctime = self.__format_timestamp__(record)
+        prefix = self.__prefix_tpl__ % {
+            "asctime": record.asctime,
+            "env": getattr(record, "env", "default"),
+            "levelcolor": level_colors.get(levelname) or color.bold(levelname),
+            "filename": record.filename,
+            "lineno": record.lineno,
+        }
+
+        lines: List[str] = []
+        proc_prefix = self.__subproc_prefix__ * self.__proc_level__
+        end_proc = getattr(record, "end_proc", False)
+        start_proc = getattr(record, "start_proc", False)
+        bold = getattr(record, "bold", False)
+        success = levelname == "SUCCESS"
+        fail = levelname == "FAILED"
+
+        if end_proc and self.__proc_level__ <= 0:
+            end_proc = False
+        if start_proc:
+            self.__proc_level__ += 1
+        elif end_proc:
+            self.__proc_level__ -= 1
+        self.__proc_level__ = max(self.__proc_level__, 0)
+
+        if "\n" in msg:
+            lines = []
+            messages = msg.splitlines()
             if start_proc:
+                first_line = (
+                    proc_prefix
+                    + self.__start_proc_prefix__ * 2
+                    + self.__process_line_fmt__(messages[0], bold, success, fail)
+                )
                 self.__proc_level__ += 1
+                proc_prefix = self.__subproc_prefix__ * self.__proc_level__
             elif end_proc:
-                self.__proc_level__ -= 1
-            self.__proc_level__ = max(self.__proc_level__, 0)
-
-            if "\n" in msg:
-                lines = []
-                messages = msg.splitlines()
-                if start_proc:
-                    first_line = (
-                        proc_prefix
-                        + self.__start_proc_prefix__ * 2
-                        + self.__process_line_fmt__(messages[0], bold, success, fail)
-                    )
-                    self.__proc_level__ += 1
-                    proc_prefix = self.__subproc_prefix__ * self.__proc_level__
-                elif end_proc:
-                    proc_prefix = self.__subproc_prefix__ * self.__proc_level__
-                    first_line = (
-                        proc_prefix
-                        + self.__start_proc_prefix__
-                        + self.__process_line_fmt__(messages[0], bold, success, fail)
-                    )
-                    lines.append(proc_prefix + self.__end_proc_prefix__)
-
-                else:
-                    first_line = (
-                        proc_prefix
-                        + self.__start_proc_prefix__
-                        + self.__process_line_fmt__(messages[0], bold, success, fail)
-                    )
-                    self.__proc_level__ += 1
-                    proc_prefix = self.__subproc_prefix__ * self.__proc_level__
-
-                lines.append(first_line)
-                lines.extend(
-                    [
-                        proc_prefix
-                        + self.__process_line_fmt__(line, bold, success, fail)
-                        for line in messages[1:-2]
-                    ]
+                proc_prefix = self.__subproc_prefix__ * self.__proc_level__
+                first_line = (
+                    proc_prefix
+                    + self.__start_proc_prefix__
+                    + self.__process_line_fmt__(messages[0], bold, success, fail)
                 )
+                lines.append(proc_prefix + self.__end_proc_prefix__)
 
-                self.__proc_level__ -= 1
+            else:
+                first_line = (
+                    proc_prefix
+                    + self.__start_proc_prefix__
+                    + self.__process_line_fmt__(messages[0], bold, success, fail)
+                )
+                self.__proc_level__ += 1
                 proc_prefix = self.__subproc_prefix__ * self.__proc_level__
 
+            lines.append(first_line)
+            lines.extend(
+                [
+                    proc_prefix + self.__process_line_fmt__(line, bold, success, fail)
+                    for line in messages[1:-2]
+                ]
+            )
+
+            self.__proc_level__ -= 1
+            proc_prefix = self.__subproc_prefix__ * self.__proc_level__
+
+            last_line = (
+                proc_prefix
+                + self.__end_proc_prefix__
+                + self.__process_line_fmt__(messages[-1], bold, success, fail)
+            )
+            if end_proc:
                 last_line = (
                     proc_prefix
                     + self.__end_proc_prefix__
                     + self.__process_line_fmt__(messages[-1], bold, success, fail)
                 )
-                if end_proc:
-                    last_line = (
-                        proc_prefix
-                        + self.__end_proc_prefix__
-                        + self.__process_line_fmt__(messages[-1], bold, success, fail)
-                    )
-                lines.append(last_line)
-            elif record.levelname == "RUNNING":
-                lines.append(">> " + msg)
-            else:
-                if start_proc:
-                    message = (
-                        proc_prefix
-                        + self.__start_proc_prefix__
-                        + self.__process_line_fmt__(msg, bold, success, fail)
-                    )
-
-                elif end_proc:
-                    proc_prefix = self.__subproc_prefix__ * self.__proc_level__
-                    message = (
-                        proc_prefix
-                        + self.__end_proc_prefix__
-                        + self.__process_line_fmt__(msg, bold, success, fail)
-                    )
-
-                else:
-                    proc_prefix = self.__subproc_prefix__ * self.__proc_level__
-                    message = proc_prefix + self.__process_line_fmt__(
-                        msg, bold, success, fail
-                    )
-
-                lines.append(message)
+            lines.append(last_line)
+        elif levelname == "RUNNING":
+            lines.append(">> " + msg)
+        else:
+            if start_proc:
+                message = (
+                    proc_prefix
+                    + self.__start_proc_prefix__
+                    + self.__process_line_fmt__(msg, bold, success, fail)
+                )
 
-            if self._show_date:
-                prefix.append(color.dark_blue(timestamp))
-            if self._show_env:
-                prefix.append(color.purple(f"({env})"))
-            if self._show_level:
-                prefix.append(
-                    f"{LOGGER_LEVEL_COLORS.get(record.levelname, color.bold(record.levelname))}"
+            elif end_proc:
+                proc_prefix = self.__subproc_prefix__ * self.__proc_level__
+                message = (
+                    proc_prefix
+                    + self.__end_proc_prefix__
+                    + self.__process_line_fmt__(msg, bold, success, fail)
                 )
-            if self._show_file:
-                prefix.append(
-                    f"{color.dark_green(record.filename)}{color.orange(':')}{color.dark_green(str(record.lineno))}"
+
+            else:
+                proc_prefix = self.__subproc_prefix__ * self.__proc_level__
+                message = proc_prefix + self.__process_line_fmt__(
+                    msg, bold, success, fail
                 )
 
-            message = (
-                delete_last
-                + " ".join(prefix)
-                + f" {lines[0]}"
-                + ("\n" if len(lines) > 1 else "")
-            )
-            message += "\n".join(
-                [(" ".join(prefix) + f" {line}").strip() for line in lines[1:]]
-            )
-            return message
-        else:
-            if self._show_date:
-                prefix.append(f"{timestamp}")
-            if self._show_env:
-                prefix.append(f"({env})")
-            if self._show_level:
-                prefix.append(f"{record.levelname:9s}")
-            if self._show_file:
-                prefix.append(f"{record.filename}:{record.lineno}")
-            return " ".join(prefix) + f" | {msg}"
+            lines.append(message)
+
+        first_line = f"{delete_last}{prefix} {lines[0]}"
+        if len(lines) == 1:
+            return first_line
+        return "\n".join(
+            [first_line, *(f"{prefix} {line}".strip() for line in lines[1:])]
+        )
 
 
 class Logger:
@@ -365,24 +618,38 @@ class Logger:
             log_file (str, optional): Path to the log file.  If None, file logging is disabled.
             max_log_size_mb (int, optional): Maximum log file size in MB (only used if log_file is provided).
             backup_count (int, optional): Number of backup log files to keep (only used if log_file is provided).
+            colors (bool, optional): Whether to color the console output, only applied when stdout is a terminal.
         """
         self.env = env
-        self.__tasks__ = []
-        self.__total_tasks__ = 0
-        self.__end_tasks__ = []
-        self.__log_queue__ = Queue()
+        self.__tasks__: Dict[str, BackgroundTask] = {}
+        self.__task_counter__ = itertools.count(1)
+        self.__end_tasks__: Deque[BackgroundTask] = collections.deque()
+        self.__log_queue__ = queue.SimpleQueue()
         self.__animation__ = ["⠙", "⠘", "⠰", "⠴", "⠤", "⠦", "⠆", "⠃", "⠋", "⠉"]
         self.v_separator = " "
-        self.__enable_colors__ = colors
+        # Escape codes are only useful on a terminal, not in redirected output
+        try:
+            self.__enable_colors__ = colors and sys.stdout.isatty()
+        except (AttributeError, ValueError):
+            self.__enable_colors__ = False
         self.__log_file__ = log_file
         self.__max_log_size__ = max_log_size_mb
         self.__backup_count__ = backup_count
         # Configuration flags
         self.flags = {"file": True, "date": True, "env": True, "level": True}
+        # Separator line for the current terminal width, built on first use.
+        # Without resize signals it is rebuilt at most once per second
+        self.__sep_line__ = None
+        self.__sep_expires__ = 0.0
+        self.__sep_ttl__ = None if self.__watch_terminal_size__() else 1.0
 
         # --- Standard Library Logging Setup ---
         self.logger = logging.getLogger()
-        self.logger.setLevel(logging.DEBUG)  # Set the *root* logger to DEBUG
+        # Records are only enqueued here, the listener thread formats and writes them
+        self.logger.addHandler(logging.handlers.QueueHandler(self.__log_queue__))
+        self.__listener__ = BatchingQueueListener(
+            self.__log_queue__, respect_handler_level=True
+        )
 
         # Create a handler that outputs to the console (StreamHandler)
         self.console_handler = None
@@ -391,12 +658,17 @@ class Logger:
         self.file_formatter: LoggerFormatter = None
         self.formatter: LoggerFormatter = None
         self.__custom_formatters__()
+        self.__build_handlers__()
 
         # --- Threading for background tasks and logging ---
-        self.__log_thread__: Thread = None
+        self.__task_thread__: Thread = None
         self.__stop_event__ = Event()  # Use an Event for cleaner thread stopping
+        # Wakes the idle task thread up when a task is started or on stop
+        self.__tasks_cv__ = Condition()
 
-        self.__start_log_thread__()
+        self.__listener__.start()
+        self.__listening__ = True
+        self.__start_task_thread__()
         __LOGGERS__.append(self)
 
     def __custom_formatters__(self):
@@ -404,137 +676,170 @@ class Logger:
         self.file_formatter = LoggerFormatter(
             colors=False, **self.flags, old=self.file_formatter
         )
-        self.formatter = LoggerFormatter(colors=True, **self.flags, old=self.formatter)
-
+        self.formatter = LoggerFormatter(
+            colors=self.__enable_colors__, **self.flags, old=self.formatter
+        )
         if self.console_handler is not None:
-            self.logger.removeHandler(self.console_handler)
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(self.formatter)  # Use custom formatter
-        console_handler.setLevel(logging.INFO)  # Default console level
-        self.console_handler = console_handler
-        self.logger.addHandler(self.console_handler)
+            self.console_handler.setFormatter(self.formatter)
+        if self.file_handler is not None:
+            self.file_handler.setFormatter(self.file_formatter)
+
+    def __build_handlers__(self):
+        """Creates the console and file handlers written by the queue listener."""
+        self.console_handler = BatchedStreamHandler(sys.stdout)
+        self.console_handler.setFormatter(self.formatter)  # Use custom formatter
+        self.console_handler.setLevel(logging.INFO)  # Default console level
 
         if self.__log_file__:
-            if self.file_handler is not None:
-                self.logger.removeHandler(self.file_handler)
-            file_handler = logging.handlers.RotatingFileHandler(
+            self.file_handler = BufferedRotatingFileHandler(
                 self.__log_file__,
                 maxBytes=self.__max_log_size__ * 1024 * 1024,  # Convert MB to bytes
                 backupCount=self.__backup_count__,
                 encoding="utf-8",
                 delay=True,
             )
-            file_handler.setFormatter(self.file_formatter)
-            file_handler.setLevel(logging.DEBUG)  # Log everything to file
-            self.file_handler = file_handler
-            self.logger.addHandler(file_handler)
+            self.file_handler.setFormatter(self.file_formatter)
+            self.file_handler.setLevel(logging.DEBUG)  # Log everything to file
 
-    def __process_log_queue__(self):
-        """Processes the log queue in a separate thread."""
-        animation_index = 0
-        last_message_log = True
-        started = False
-        cycle_start = time()
-        delta = 0.2
-        while not self.__stop_event__.is_set() or not self.__log_queue__.empty():
-            cycle_period = time()
+        self.__listener__.handlers = tuple(
+            handler
+            for handler in (self.console_handler, self.file_handler)
+            if handler is not None
+        )
+        self.__update_level__()
+
+    def __update_level__(self):
+        """Lets isEnabledFor() drop the records no handler would write."""
+        self.logger.setLevel(
+            min(handler.level for handler in self.__listener__.handlers)
+        )
+
+    def __log_end_tasks__(self):
+        """Logs the result of the finished background tasks."""
+        while True:
+            # Also called from `finish`, the deque may be emptied by the
+            # other thread between a length check and the pop
             try:
-                # Get a task from the queue.  Use a timeout to allow checking _stop_event.
-                num_tasks = len(self.__tasks__)  # +1 for the current task
-                if num_tasks > 0 and (cycle_period - cycle_start) >= delta:
-                    cycle_start = time()
-                    task = self.__tasks__[0]
-                    message, start_time, now, frame, level_value = (
-                        task["message"],
-                        task["start_time"],
-                        task["now"],
-                        task["frame"],
-                        task["level"],
-                    )
-                    log_message = f"{message} ({num_tasks} bg tasks) {self.__animation__[animation_index]} ({format_elapsed_time(start_time, time())})"
-
-                    self.log("RUNNING", log_message, frame=task["frame"])
-                    # sleep(0.1)
-                    # self.remove_line()
-                    animation_index = (animation_index + 1) % len(self.__animation__)
-
-                if len(self.__end_tasks__) > 0:
-                    for task in self.__end_tasks__.copy():
-                        self.__end_tasks__.remove(task)
-                        if task["success"]:
-                            log_level = "COMPLETED"
-                            log_msg = f"{task['message']} ✅ ({format_elapsed_time(task['start_time'], time())}){task['postfix']}"
-                        else:
-                            log_level = "FAILED"
-                            log_msg = f"{task['message']} ❌ ({format_elapsed_time(task['start_time'], time())}){task['postfix']}"
-
-                        self.log(log_level, log_msg, frame=task["frame"])
-
-                if not self.__log_queue__.empty():
-                    log_event = self.__log_queue__.get(timeout=0.1)
-                    filename = (
-                        "/".join(
-                            log_event["frame"].f_code.co_filename.split(os.sep)[-2:]
-                        )
-                        if log_event["frame"]
-                        else "unknown"
-                    )
-                    line = log_event["frame"].f_lineno if log_event["frame"] else 0
-
-                    # Use standard library logging, but format as before.
-                    log_record = self.logger.makeRecord(
-                        self.env,
-                        log_event["level"],
-                        filename,
-                        line,
-                        log_event["log"],
-                        (
-                            {
-                                "timestamp": log_event["timestamp"],
-                                "last_log": last_message_log,
-                                "started": started,
-                                "env": self.env,
-                                "bold": log_event["bold"],
-                                "start_proc": log_event["start_proc"],
-                                "end_proc": log_event["end_proc"],
-                                "raw": log_event["raw"],
-                            },
-                        ),
-                        None,
+                task = self.__end_tasks__.popleft()
+            except IndexError:
+                break
+            if task.success:
+                level_value = __LEVEL_COMPLETED__
+                log_fmt = "%s ✅ (%s)%s"
+            else:
+                level_value = __LEVEL_FAILED__
+                log_fmt = "%s ❌ (%s)%s"
+            if not self.logger.isEnabledFor(level_value):
+                continue
+            self.__log__(
+                level_value,
+                log_fmt,
+                (
+                    task.message,
+                    format_elapsed_time(task.start_time, task.end_time),
+                    task.postfix,
+                ),
+                location=task.location,
+            )
+
+    def __process_task_queue__(self):
+        """Animates the running background tasks in a separate thread.
+
+        The frames rewrite the previous line, which only works on a colored
+        terminal console. Otherwise `start` logs a single line per task and
+        this thread only keeps flushing the log file.
+        """
+        animate = self.__enable_colors__
+        animation = self.__animation__
+        num_frames = len(animation)
+        animation_index = 0
+        running_level = __LEVEL_RUNNING__
+        # Only the frame and the elapsed time change between frames
+        head_task = None
+        head_tasks = 0
+        head = ""
+        tasks = self.__tasks__
+        tasks_cv = self.__tasks_cv__
+        stop_event = self.__stop_event__
+        while not stop_event.is_set():
+            with tasks_cv:
+                # Sleep while there is nothing to animate, the timeout keeps
+                # flushing the buffered log file
+                tasks_cv.wait_for(
+                    lambda: (animate and tasks) or stop_event.is_set(), timeout=1.0
+                )
+                # Tasks are only added and removed under the condition lock
+                num_tasks = len(tasks)
+                task = next(reversed(tasks.values())) if num_tasks else None
+            frame_deadline = monotonic() + 0.2
+            if animate and task is not None and self.logger.isEnabledFor(running_level):
+                if task is not head_task or num_tasks != head_tasks:
+                    head_task = task
+                    head_tasks = num_tasks
+                    head = f"{task.message} ({num_tasks} bg tasks)"
+                self.__log__(
+                    running_level,
+                    "%s %s (%s)",
+                    (
+                        head,
+                        animation[animation_index],
+                        format_elapsed_time(task.start_time, time()),
+                    ),
+                    location=task.location,
+                )
+                animation_index = (animation_index + 1) % num_frames
+
+            self.__log_end_tasks__()
+            if self.file_handler is not None:
+                self.file_handler.flush_if_due()
+            remaining = frame_deadline - monotonic()
+            if animate and num_tasks > 0 and remaining > 0:
+                with tasks_cv:
+                    # Next frame, or earlier when a task starts or finishes
+                    tasks_cv.wait_for(
+                        lambda: stop_event.is_set() or len(tasks) != num_tasks,
+                        timeout=remaining,
                     )
-                    self.logger.handle(log_record)
-                    if LOGGER_LEVELS["RUNNING"] == log_event["level"]:
-                        last_message_log = False
-                    else:
-                        last_message_log = True
-                    if not started:
-                        started = True
-                    if log_event["raise"]:
-                        raise Exception(message)
-
-            except Exception as e:
-                print(e)
-                raise e
-
-    def __start_log_thread__(self):
-        """Starts the log processing thread."""
-        if self.__log_thread__ is None or not self.__log_thread__.is_alive():
+        self.__log_end_tasks__()
+
+    def __watch_terminal_size__(self) -> bool:
+        """Drops the cached separator line when the terminal is resized.
+
+        Returns:
+            bool: Whether resize signals are watched on this platform
+        """
+        try:
+            previous = signal.getsignal(signal.SIGWINCH)
+
+            def on_resize(signum, frame):
+                self.__sep_line__ = None
+                if callable(previous):
+                    previous(signum, frame)
+
+            signal.signal(signal.SIGWINCH, on_resize)
+            return True
+        except (AttributeError, ValueError):
+            # No SIGWINCH on Windows, or not created from the main thread
+            return False
+
+    def __start_task_thread__(self):
+        """Starts the background tasks processing thread."""
+        if self.__task_thread__ is None or not self.__task_thread__.is_alive():
             self.__stop_event__.clear()  # Make sure it's clear
-            self.__log_thread__ = Thread(target=self.__process_log_queue__, daemon=True)
-            self.__log_thread__.start()
+            self.__task_thread__ = Thread(
+                target=self.__process_task_queue__, daemon=True
+            )
+            self.__task_thread__.start()
 
     def __get_message__(self, *messages) -> str:
-        res = []
-        for msg in messages:
-            if isinstance(msg, (dict, list)):  # Use isinstance for type checking
-                res.append(json.dumps(msg))
-            else:
-                res.append(str(msg))
-        return self.v_separator.join(res)
+        if len(messages) == 1:
+            msg = messages[0]
+            return msg if type(msg) is str else __to_text__(msg)
+        return self.v_separator.join(map(__to_text__, messages))
 
     def set_env(self, env: str):
+        # The env is stored on each record, the formatters don't change
         self.env = env
-        self.__custom_formatters__()
 
     def set_level(self, level: str):
         """Set the logging level for the console handler."""
@@ -542,7 +847,7 @@ class Logger:
         if level not in LOGGER_LEVELS:
             raise ValueError(f"Invalid log level: {level}")
         self.console_handler.setLevel(LOGGER_LEVELS[level])
-        self.__custom_formatters__()
+        self.__update_level__()
 
     def show_file(self, show=True):
         self.flags["file"] = show
@@ -564,7 +869,7 @@ class Logger:
         self,
         level: str,
         *messages,
-        frame=None,
+        stacklevel=1,
         _raise=False,
         start_sub=False,
         end_sub=False,
@@ -573,146 +878,211 @@ class Logger:
     ):
         """Logs a message at the specified level.
 
-        Adds the log entry to the queue for processing in a separate thread.
+        The record is enqueued and written by the listener thread.
         """
-        now = datetime.datetime.now().isoformat(timespec="milliseconds")
-
         level_value = LOGGER_LEVELS.get(level.upper())
         if level_value is None:
             raise ValueError(f"Invalid log level: {level}")
 
-        if not frame:
-            frame = inspect.currentframe().f_back.f_back
+        if not self.logger.isEnabledFor(level_value):
+            if _raise:
+                raise Exception(self.__get_message__(*messages))
+            return
 
         message = self.__get_message__(*messages)
+        self.__log__(
+            level_value,
+            message,
+            None,
+            stacklevel=stacklevel + 1,
+            start_sub=start_sub,
+            end_sub=end_sub,
+            raw=raw,
+            bold=bold,
+        )
+        if _raise:
+            raise Exception(message)
+
+    def __log__(
+        self,
+        level_value: int,
+        msg: str,
+        args,
+        stacklevel=1,
+        location=None,
+        start_sub=False,
+        end_sub=False,
+        raw=False,
+        bold=False,
+    ):
+        """Builds the record and hands it to the queue handler.
 
-        body = {
-            "level_name": level.upper(),
-            "level": level_value,
-            "log": message,
-            "frame": frame,
-            "timestamp": now,
-            "raise": _raise,
+        `msg` is only interpolated with `args` when the record is formatted.
+        The caller location is found by the logging module from `stacklevel`,
+        unless a `(pathname, lineno)` location is given.
+        """
+        extra = {
+            "env": self.env,
             "bold": start_sub or bold or end_sub,
             "start_proc": start_sub,
             "end_proc": end_sub,
             "raw": raw,
         }
-        return self.__log_queue__.put_nowait(body)
+        if location is None:
+            self.logger.log(
+                level_value, msg, *(args or ()), extra=extra, stacklevel=stacklevel + 1
+            )
+            return
+        record = self.logger.makeRecord(
+            self.env,
+            level_value,
+            location[0],
+            location[1],
+            msg,
+            args,
+            None,
+            extra=extra,
+        )
+        self.logger.handle(record)
 
     def sep(self):
-        global HORIZONTAL_SEPARATOR
         """Prints a horizontal separator."""
-        width = shutil.get_terminal_size((80, 20))[0]
-        frame = inspect.currentframe().f_back
+        if not self.logger.isEnabledFor(__LEVEL_SEP__):
+            return
+        if self.__sep_line__ is None or (
+            self.__sep_ttl__ and monotonic() >= self.__sep_expires__
+        ):
+            width = shutil.get_terminal_size((80, 20))[0]
+            self.__sep_line__ = HORIZONTAL_SEPARATOR * width
+            if self.__sep_ttl__:
+                self.__sep_expires__ = monotonic() + self.__sep_ttl__
         # Use logger to go through the queue
-        self.log("SEP", HORIZONTAL_SEPARATOR * width, frame=frame)
+        self.__log__(__LEVEL_SEP__, self.__sep_line__, None, stacklevel=2)
 
     def trace(self, *messages, start_sub=False, end_sub=False, raw=False):
-        frame = inspect.currentframe().f_back
-        self.log(
-            "TRACE",
-            *messages,
-            frame=frame,
+        if not self.logger.isEnabledFor(__LEVEL_TRACE__):
+            return
+        self.__log__(
+            __LEVEL_TRACE__,
+            self.__get_message__(*messages),
+            None,
+            stacklevel=2,
             start_sub=start_sub,
             end_sub=end_sub,
             raw=raw,
         )
 
     def debug(self, *messages, start_sub=False, end_sub=False, raw=False):
-        frame = inspect.currentframe().f_back
-        self.log(
-            "DEBUG",
-            *messages,
-            frame=frame,
+        if not self.logger.isEnabledFor(__LEVEL_DEBUG__):
+            return
+        self.__log__(
+            __LEVEL_DEBUG__,
+            self.__get_message__(*messages),
+            None,
+            stacklevel=2,
             start_sub=start_sub,
             end_sub=end_sub,
             raw=raw,
         )
 
     def info(self, *messages, start_sub=False, end_sub=False, raw=False):
-        frame = inspect.currentframe().f_back
-        self.log(
-            "INFO",
-            *messages,
-            frame=frame,
+        if not self.logger.isEnabledFor(__LEVEL_INFO__):
+            return
+        self.__log__(
+            __LEVEL_INFO__,
+            self.__get_message__(*messages),
+            None,
+            stacklevel=2,
             start_sub=start_sub,
             end_sub=end_sub,
             raw=raw,
         )
 
     def success(self, *messages, start_sub=False, end_sub=False, raw=False):
-        frame = inspect.currentframe().f_back
-        self.log(
-            "SUCCESS",
-            *messages,
-            frame=frame,
+        if not self.logger.isEnabledFor(__LEVEL_SUCCESS__):
+            return
+        self.__log__(
+            __LEVEL_SUCCESS__,
+            self.__get_message__(*messages),
+            None,
+            stacklevel=2,
             start_sub=start_sub,
             end_sub=end_sub,
             raw=raw,
         )
 
     def failed(self, *messages, start_sub=False, end_sub=False, raw=False):
-        frame = inspect.currentframe().f_back
-        self.log(
-            "FAILED",
-            *messages,
-            frame=frame,
+        if not self.logger.isEnabledFor(__LEVEL_FAILED__):
+            return
+        self.__log__(
+            __LEVEL_FAILED__,
+            self.__get_message__(*messages),
+            None,
+            stacklevel=2,
             start_sub=start_sub,
             end_sub=end_sub,
             raw=raw,
         )
 
     def warn(self, *messages, start_sub=False, end_sub=False, raw=False):
-        frame = inspect.currentframe().f_back
-        self.log(
-            "WARNING",
-            *messages,
-            frame=frame,
+        if not self.logger.isEnabledFor(__LEVEL_WARNING__):
+            return
+        self.__log__(
+            __LEVEL_WARNING__,
+            self.__get_message__(*messages),
+            None,
+            stacklevel=2,
             start_sub=start_sub,
             end_sub=end_sub,
             raw=raw,
         )
 
     def error(self, *messages, start_sub=False, end_sub=False, raw=False):
-        frame = inspect.currentframe().f_back
-        self.log(
-            "ERROR",
-            *messages,
-            frame=frame,
+        if not self.logger.isEnabledFor(__LEVEL_ERROR__):
+            return
+        self.__log__(
+            __LEVEL_ERROR__,
+            self.__get_message__(*messages),
+            None,
+            stacklevel=2,
             start_sub=start_sub,
             end_sub=end_sub,
             raw=raw,
         )
 
     def critical(self, *messages, start_sub=False, end_sub=False, raw=False):
-        frame = inspect.currentframe().f_back
-        self.log(
-            "CRITICAL",
-            *messages,
-            frame=frame,
+        if not self.logger.isEnabledFor(__LEVEL_CRITICAL__):
+            return
+        self.__log__(
+            __LEVEL_CRITICAL__,
+            self.__get_message__(*messages),
+            None,
+            stacklevel=2,
             start_sub=start_sub,
             end_sub=end_sub,
             raw=raw,
         )
 
     def done(self, *messages, start_sub=False, end_sub=False, raw=False):
-        frame = inspect.currentframe().f_back
-        self.log(
-            "DONE",
-            *messages,
-            frame=frame,
+        if not self.logger.isEnabledFor(__LEVEL_DONE__):
+            return
+        self.__log__(
+            __LEVEL_DONE__,
+            self.__get_message__(*messages),
+            None,
+            stacklevel=2,
             start_sub=start_sub,
             end_sub=end_sub,
             raw=raw,
         )
 
     def exception(self, *messages, _raise=True):
-        frame = inspect.currentframe().f_back
+        if not _raise and not self.logger.isEnabledFor(__LEVEL_EXCEPTION__):
+            return
         self.log(
             "EXCEPTION",
             *messages,
-            frame=frame,
+            stacklevel=2,
             _raise=_raise,
             start_sub=False,
             end_sub=False,
@@ -721,7 +1091,7 @@ class Logger:
 
     def remove_line(self):
         """Method to remove one line from the command line"""
-        print("\033[A\033[K", end="")
+        self.remove_lines(1)
 
     def remove_lines(self, num: int):
         """Method to remove multiple line from the command line
@@ -729,26 +1099,26 @@ class Logger:
         Args:
             num (int): Number of lines to be cleared
         """
-        for i in range(num):
-            self.remove_line()
+        # Move up and clear each line with a single write
+        sys.stdout.write("\033[A\033[K" * num)
+        sys.stdout.flush()
 
     def start(self, *messages) -> str:
         """Starts a background task, adding it to the queue."""
         start_time = time()
         message = self.__get_message__(*messages)
-        self.__total_tasks__ += 1
-        task_id = self.__total_tasks__
-        frame = inspect.currentframe().f_back
-        task = {
-            "id": task_id,
-            "message": message,
-            "start_time": start_time,
-            "now": datetime.datetime.now().isoformat(timespec="milliseconds"),
-            "frame": frame,
-            "level": LOGGER_LEVELS.get("RUNNING"),
-        }
+        task_id = f"t{next(self.__task_counter__)}"
+        caller = sys._getframe(1)
+        task = BackgroundTask(
+            task_id, message, start_time, (caller.f_code.co_filename, caller.f_lineno)
+        )
+        if not self.__enable_colors__ and self.logger.isEnabledFor(__LEVEL_RUNNING__):
+            # Without animation frames, the task start is logged once
+            self.__log__(__LEVEL_RUNNING__, "%s", (message,), location=task.location)
         # Put the log information into the queue
-        self.__tasks__.append(task)
+        with self.__tasks_cv__:
+            self.__tasks__[task_id] = task
+            self.__tasks_cv__.notify()
 
         # # Start the processing thread if it's not already running
         # if self._task_thread is None or not self._task_thread.is_alive():
@@ -762,32 +1132,47 @@ class Logger:
     def finish(self, task_id: str, *messages, success: bool = True):
         """Marks a task as finished and logs the result.
 
-        Since we're using a queue,  we don't "finish" a specific task by ID.
-        Instead we log a completion message, and the processing thread
-        will eventually clear the queue.
+        The task is removed from the running tasks and handed over to the
+        finished tasks queue, nothing else keeps a reference to it.
         """
-        frame = inspect.currentframe().f_back
+        caller = sys._getframe(1)
         message = self.__get_message__(*messages)
         postfix = f" {message}" if message.strip() else ""
-        # Find the task in the queue by ID and remove it
-        task = list(filter(lambda x: x["id"] == task_id, self.__tasks__))
-        if len(task) == 0:
+        # Find the task by ID and remove it
+        with self.__tasks_cv__:
+            task = self.__tasks__.pop(task_id, None)
+            self.__tasks_cv__.notify()
+        if task is None:
             return
-        task = task[0]
-        self.__tasks__.remove(task)
-        task["result_message"] = message
-        task["postfix"] = postfix
-        task["success"] = success
-        task["frame"] = frame
-        self.__end_tasks__.append(task.copy())
+        task.result_message = message
+        task.postfix = postfix
+        task.success = success
+        task.location = (caller.f_code.co_filename, caller.f_lineno)
+        task.end_time = time()
+        self.__end_tasks__.append(task)
+        self.__log_end_tasks__()
 
     def clear_threads(self) -> None:
-        """Stop any running task animation threads."""
+        """Stop the task animation thread and flush the pending log records."""
         self.__stop_event__.set()
-
-        if self.__log_thread__:
-            self.__log_thread__.join()
-            self.__log_thread__ = None
+        with self.__tasks_cv__:
+            self.__tasks_cv__.notify_all()
+
+        if self.__task_thread__:
+            self.__task_thread__.join()
+            self.__task_thread__ = None
+        if self.__listening__:
+            self.__listener__.stop()
+            self.__listening__ = False
+        # Write what was buffered for the records queued before the stop
+        for handler in (self.console_handler, self.file_handler):
+            if handler is None:
+                continue
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                # Closed or broken stream, like logging.shutdown() ignores
+                pass
         self.__stop_event__.clear()
 
     def __enter__(self):
@@ -2,11 +2,14 @@ import sys
 
 sys.path.append("..")
 
+import itertools
 import os
+import selectors
 import shlex
 import subprocess
-from time import time
-from typing import Any, Callable, List, Optional, Union
+from functools import lru_cache
+from time import monotonic
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from ..classes import CommandError
 from .logger import log
@@ -25,19 +28,13 @@ def split_array_by_value(array: List[str], split_value: str) -> List[List[str]]:
     """
     if not split_value in array:
         return array
-    result = []
-    current_sub_array = []
-    for element in array:
-        if element == split_value:
-            if current_sub_array:
-                result.append(current_sub_array)
-            current_sub_array = []
-        else:
-            current_sub_array.append(element)
-    if current_sub_array:
-        result.append(current_sub_array)
-
-    return result
+    return [
+        list(group)
+        for is_separator, group in itertools.groupby(
+            array, key=lambda element: element == split_value
+        )
+        if not is_separator
+    ]
 
 
 def clean_command(cmd: List[str]) -> List[str]:
@@ -50,10 +47,13 @@ def clean_command(cmd: List[str]) -> List[str]:
     Returns:
         Filtered list with only valid command arguments
     """
-    res = list(filter(lambda x: x is not None and len(x) > 0, cmd))
-    # res =[shlex.quote(item) for item in res]
-    # print(res)
-    return res
+    return [arg for arg in cmd if arg]
+
+
+@lru_cache(maxsize=256)
+def __split_command__(cmd: str) -> Tuple[str, ...]:
+    """Tokenizes a command string, repeated commands reuse the tokens."""
+    return tuple(shlex.split(cmd))
 
 
 def cmd_to_array(cmd: str) -> List[List[str]]:
@@ -67,17 +67,86 @@ def cmd_to_array(cmd: str) -> List[List[str]]:
         A list of command arrays, each representing a command in the pipeline
     """
     try:
-        return split_array_by_value(shlex.split(cmd), "|")
+        return split_array_by_value(list(__split_command__(cmd)), "|")
     except ValueError as e:
         log.error(f"Error parsing command: {e}")
         return [[]]
 
 
+def __read_lines__(proc: subprocess.Popen) -> Iterator[Tuple[bytes, bool]]:
+    """
+    Read the stdout and stderr lines of a process as soon as they are available.
+
+    Args:
+        proc: Process started with piped stdout and stderr
+
+    Returns:
+        An iterator of (line, is_stderr) tuples, lines keep their line break
+    """
+    stdout, stderr = proc.stdout, proc.stderr
+    if stdout is None or stderr is None:
+        raise ValueError("The process stdout and stderr must be piped")
+    if os.name == "nt":
+        # Pipes can't be waited on with select on Windows
+        while True:
+            line = stdout.readline()
+            error_line = stderr.readline()
+            if not line and not error_line:
+                return
+            if error_line:
+                yield error_line, True
+            if line:
+                yield line, False
+
+    # Chunks of the line being read on each pipe, joined once the line is complete
+    # so long lines (like `show -json` documents) aren't copied on every read
+    pending: Dict[int, List[bytes]] = {
+        stdout.fileno(): [],
+        stderr.fileno(): [],
+    }
+    with selectors.DefaultSelector() as selector:
+        selector.register(stdout, selectors.EVENT_READ, False)
+        selector.register(stderr, selectors.EVENT_READ, True)
+        while selector.get_map():
+            for key, _ in selector.select():
+                chunk = os.read(key.fd, 65536)
+                parts = pending[key.fd]
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    if parts:
+                        yield b"".join(parts), key.data
+                    continue
+                start = 0
+                end = chunk.find(b"\n")
+                while end != -1:
+                    parts.append(chunk[start : end + 1])
+                    line = b"".join(parts)
+                    parts.clear()
+                    yield line, key.data
+                    start = end + 1
+                    end = chunk.find(b"\n", start)
+                if start < len(chunk):
+                    parts.append(chunk[start:])
+
+
 class CommandResult:
     """
     Container for the results of a command execution.
     """
 
+    __slots__ = (
+        "success",
+        "code",
+        "command",
+        "stdout",
+        "stderr",
+        "callback_output",
+        "line_callback_output",
+        "duration",
+        "result",
+        "stdout_bytes",
+    )
+
     def __init__(
         self,
         success: bool,
@@ -87,8 +156,9 @@ class CommandResult:
         stderr: str,
         callback_output: Any,
         line_callback_output: List[Any],
-        start_time: float = time(),
+        start_time: Optional[float] = None,
         result: Optional[Any] = None,
+        stdout_bytes: Optional[bytes] = None,
     ):
         self.success = success
         self.code = code
@@ -97,12 +167,15 @@ class CommandResult:
         self.stderr = stderr
         self.callback_output = callback_output
         self.line_callback_output = line_callback_output
-        self.duration = round(time() - start_time, 4)
+        if start_time is None:
+            start_time = monotonic()
+        self.duration = round(monotonic() - start_time, 4)
         self.result = result
+        self.stdout_bytes = stdout_bytes
 
     def __str__(self) -> str:
         """String representation of the command result."""
-        return f"CommandResult(success={self.success}, code={self.code}, command={' '.join(self.command)}, stdout_len={len(self.stdout)}, stderr_len={len(self.stderr)}, duration={self.duration}s)"
+        return f"CommandResult(success={self.success}, code={self.code}, command={self.command}, stdout_len={len(self.stdout)}, stderr_len={len(self.stderr)}, duration={self.duration}s)"
 
     def raise_for_status(self) -> None:
         """Raise an exception if the command failed."""
@@ -110,6 +183,13 @@ class CommandResult:
             raise CommandError("Command failed", self.code, self.stdout, self.stderr)
 
 
+def __partial_stdout__(stdout_lines: List[str], stdout_chunks: List[bytes]) -> str:
+    """Returns the stdout read so far, whether it was kept decoded or raw."""
+    if stdout_chunks:
+        return b"".join(stdout_chunks).decode("utf-8", errors="ignore")
+    return "".join(stdout_lines)
+
+
 def run_command(
     cmd: Union[List[str], List[List[str]]],
     line_callback: Optional[Callable[[str, str], Any]] = None,
@@ -119,6 +199,7 @@ def run_command(
     title: str = "",
     env: Optional[dict] = None,
     timeout: Optional[int] = None,
+    raw: bool = False,
 ) -> CommandResult:
     """
     Execute a command with optional callbacks for line-by-line processing.
@@ -132,11 +213,13 @@ def run_command(
         title: Optional title to display in logs
         env: Optional environment variables to pass to the subprocess
         timeout: Optional timeout in seconds
+        raw: Whether to keep stdout undecoded in CommandResult.stdout_bytes only,
+            without logging it or passing it to the line callback
 
     Returns:
         CommandResult object containing execution results
     """
-    start_time = time()
+    start_time = monotonic()
     print(cmd)
     cmd = split_array_by_value(cmd, "|")
     # Prepare environment variables
@@ -189,8 +272,9 @@ def run_command(
     except Exception as e:
         raise CommandError(e.with_traceback(), proc.returncode, "", proc.stderr.read())
 
-    stdout = ""
-    stderr = ""
+    stdout_lines = []
+    stderr_lines = []
+    stdout_chunks = []
     line_callback_result = []
 
     try:
@@ -201,24 +285,24 @@ def run_command(
         else:
             proc_timeout = None
 
-        while True:
-            line = proc.stdout.readline().decode("utf-8", errors="ignore")
-            error_line = proc.stderr.readline().decode("utf-8", errors="ignore")
-
-            if not line and not error_line:
-                break
-
-            # try:
+        for raw_line, is_error in __read_lines__(proc):
+            line = ""
+            error_line = ""
+            if is_error:
+                error_line = raw_line.decode("utf-8", errors="ignore")
+            elif raw:
+                stdout_chunks.append(raw_line)
+                continue
+            else:
+                line = raw_line.decode("utf-8", errors="ignore")
 
             if error_line:
-                # No need to decode since we're using text mode
-                stderr += error_line
+                stderr_lines.append(error_line)
                 if show_output:
                     log.error(error_line.rstrip())
 
             if line:
-                # No need to decode since we're using text mode
-                stdout += line
+                stdout_lines.append(line)
                 if show_output:
                     log.info(line.rstrip())
 
@@ -231,6 +315,8 @@ def run_command(
                     log.error(e)
 
         proc.wait(timeout=proc_timeout)
+        stdout = "".join(stdout_lines)
+        stderr = "".join(stderr_lines)
         res_callback = None
         if callback:
             try:
@@ -247,6 +333,7 @@ def run_command(
             res_callback,
             line_callback_result,
             start_time,
+            stdout_bytes=b"".join(stdout_chunks) if raw else None,
         )
     except subprocess.TimeoutExpired as e:
         proc.kill()
@@ -254,8 +341,8 @@ def run_command(
         raise CommandError(
             e.cmd,
             -1,
-            stdout,
-            stderr + f"\nCommand timed out after {timeout} seconds",
+            __partial_stdout__(stdout_lines, stdout_chunks),
+            "".join(stderr_lines) + f"\nCommand timed out after {timeout} seconds",
         )
     except Exception as e:
         proc.kill()
@@ -265,6 +352,6 @@ def run_command(
         raise CommandError(
             json.dumps(e.args),
             -1,
-            stdout,
-            stderr + f"\nException during execution: {str(e)}",
+            __partial_stdout__(stdout_lines, stdout_chunks),
+            "".join(stderr_lines) + f"\nException during execution: {str(e)}",
         )
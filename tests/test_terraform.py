@@ -1,7 +1,24 @@
 import pytest
+import collections
+import io
 import json
+import logging
+import logging.handlers
+import os
+import queue
+import subprocess
+import sys
+import time
 from unittest.mock import patch, MagicMock
-from terraform_python import Terraform, TerraformResult, TerraformError
+from terraform_python import MAX_CLI_VARS, Terraform, TerraformResult, TerraformError
+from terraform_python.utils import log
+from terraform_python.utils.logger import (
+    BatchedStreamHandler,
+    BatchingQueueListener,
+    BufferedRotatingFileHandler,
+    format_elapsed_time,
+)
+from terraform_python.utils.utils import __read_lines__, run_command
 
 
 @pytest.fixture
@@ -17,7 +34,7 @@ def test_terraform_init(mock_terraform):
     assert mock_terraform.__lock__ is True
     assert mock_terraform.__lock_timeout__ == "0s"
     assert mock_terraform.__input__ is False
-    assert mock_terraform.__paralellism__ == 10
+    assert mock_terraform.__parallelism__ == 3 * (os.cpu_count() or 4)
     assert mock_terraform.__color__ is True
     assert mock_terraform.__var_file__ is None
 
@@ -120,3 +137,362 @@ def test_terraform_show(mock_cmd, mock_terraform):
 
     assert result.success is True
     assert result.result["output"] == "success"
+
+
+def test_terraform_at_least(mock_terraform):
+    """Test the version gate compares (major, minor, patch) tuple-wise."""
+    mock_terraform.__version_tuple__ = (1, 0, 5)
+
+    assert mock_terraform.__at_least__(1, 0) is True
+    assert mock_terraform.__at_least__(1, 0, 5) is True
+    assert mock_terraform.__at_least__(1, 1) is False
+    assert mock_terraform.__at_least__(0, 15, 2) is True
+
+
+def test_batched_console_flushes_when_queue_drains():
+    """Test a console line isn't held back by a queued record only the file gets."""
+    log_queue = queue.SimpleQueue()
+    console_stream = io.StringIO()
+    console = BatchedStreamHandler(console_stream)
+    console.setLevel(logging.INFO)
+    file_handler = logging.StreamHandler(io.StringIO())
+    file_handler.setLevel(logging.DEBUG)
+    listener = BatchingQueueListener(
+        log_queue, console, file_handler, respect_handler_level=True
+    )
+    logger = logging.getLogger("test_batched_console")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    listener.start()
+    try:
+        logger.info("Running: step")
+        logger.debug("Command: step")
+        deadline = time.monotonic() + 1
+        while "Running: step" not in console_stream.getvalue():
+            assert time.monotonic() < deadline, "console line was held back"
+            time.sleep(0.01)
+        assert "Command: step" not in console_stream.getvalue()
+    finally:
+        listener.stop()
+        logger.removeHandler(queue_handler)
+
+
+def test_batched_console_joins_burst():
+    """Test records handled in a burst are written together on flush."""
+    stream = io.StringIO()
+    handler = BatchedStreamHandler(stream, max_batch=3)
+    for message in ("a", "b"):
+        handler.handle(logging.makeLogRecord({"msg": message}))
+    assert stream.getvalue() == ""
+    handler.handle(logging.makeLogRecord({"msg": "c"}))
+    assert stream.getvalue() == "a\nb\nc\n"
+    handler.handle(logging.makeLogRecord({"msg": "d"}))
+    handler.flush()
+    assert stream.getvalue() == "a\nb\nc\nd\n"
+
+
+class __BrokenStream__(io.StringIO):
+    def write(self, data):
+        raise BrokenPipeError
+
+
+def test_batched_console_drops_failed_batch(monkeypatch):
+    """Test a failed write is reported and its batch isn't written again."""
+    handler = BatchedStreamHandler(__BrokenStream__())
+    errors = []
+    monkeypatch.setattr(
+        handler, "handleError", lambda record: errors.append(sys.exc_info()[0])
+    )
+    handler.handle(logging.makeLogRecord({"msg": "lost"}))
+    handler.flush()
+    assert errors == [BrokenPipeError]
+
+    stream = io.StringIO()
+    handler.setStream(stream)
+    handler.handle(logging.makeLogRecord({"msg": "next"}))
+    handler.flush()
+    assert stream.getvalue() == "next\n"
+
+
+def test_batching_listener_survives_broken_console(monkeypatch):
+    """Test a failed console write doesn't stop the records of other handlers."""
+    log_queue = queue.SimpleQueue()
+    console = BatchedStreamHandler(__BrokenStream__())
+    monkeypatch.setattr(console, "handleError", lambda record: None)
+    file_stream = io.StringIO()
+    listener = BatchingQueueListener(
+        log_queue, console, logging.StreamHandler(file_stream)
+    )
+    listener.start()
+    try:
+        log_queue.put(logging.makeLogRecord({"msg": "first"}))
+        # Let the queue drain so the failing console flush runs in between
+        deadline = time.monotonic() + 1
+        while "first" not in file_stream.getvalue():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        log_queue.put(logging.makeLogRecord({"msg": "second"}))
+    finally:
+        listener.stop()
+    assert file_stream.getvalue() == "first\nsecond\n"
+
+
+def __run_python__(code: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-c", code], stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+
+
+def test_read_lines_interleaved_pipes():
+    """Test stdout and stderr lines are tagged with their stream and kept in order."""
+    proc = __run_python__(
+        "import sys\n"
+        "for i in range(3):\n"
+        "    print('out', i, flush=True)\n"
+        "    print('err', i, file=sys.stderr, flush=True)\n"
+    )
+    lines = list(__read_lines__(proc))
+    proc.wait()
+
+    assert [line for line, is_error in lines if not is_error] == [
+        b"out 0\n",
+        b"out 1\n",
+        b"out 2\n",
+    ]
+    assert [line for line, is_error in lines if is_error] == [
+        b"err 0\n",
+        b"err 1\n",
+        b"err 2\n",
+    ]
+
+
+def test_read_lines_trailing_line_without_newline():
+    """Test the last line is returned at EOF even without a line break."""
+    proc = __run_python__("import sys; sys.stdout.write('first\\nlast')")
+    lines = list(__read_lines__(proc))
+    proc.wait()
+
+    assert lines == [(b"first\n", False), (b"last", False)]
+
+
+def test_read_lines_long_line():
+    """Test a line spanning many pipe reads is returned whole."""
+    size = 3 * 1024 * 1024
+    proc = __run_python__(
+        f"import sys; sys.stdout.write('x' * {size} + '\\n' + 'end\\n')"
+    )
+    lines = list(__read_lines__(proc))
+    proc.wait()
+
+    assert [len(line) for line, _ in lines] == [size + 1, 4]
+    assert lines[0][0] == b"x" * size + b"\n"
+
+
+def test_buffered_file_handler_keeps_records_buffered_with_max_bytes(tmp_path):
+    """Test the rollover check doesn't flush the buffered records."""
+    path = tmp_path / "buffered.log"
+    handler = BufferedRotatingFileHandler(
+        path, maxBytes=1024 * 1024, backupCount=1, flush_interval=60
+    )
+    logger = logging.getLogger("test_buffered_file_handler_max_bytes")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(20):
+            logger.info("record %d", i)
+        assert os.path.getsize(path) == 0
+        handler.flush_interval = 0
+        handler.flush()
+        assert os.path.getsize(path) == sum(len(f"record {i}\n") for i in range(20))
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def test_buffered_file_handler_counts_encoded_bytes(tmp_path):
+    """Test non-ASCII records count their encoded size against maxBytes."""
+    path = tmp_path / "unicode.log"
+    handler = BufferedRotatingFileHandler(
+        path, maxBytes=100, backupCount=1, encoding="utf-8", flush_interval=60
+    )
+    logger = logging.getLogger("test_buffered_file_handler_encoded_bytes")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for _ in range(12):
+            logger.info("task ✅")
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    assert os.path.getsize(path) <= 100
+    assert os.path.getsize(tmp_path / "unicode.log.1") <= 100
+
+
+def test_buffered_file_handler_rolls_over(tmp_path):
+    """Test the file still rotates once the tracked size reaches maxBytes."""
+    path = tmp_path / "rotating.log"
+    path.write_text("x" * 90 + "\n")
+    handler = BufferedRotatingFileHandler(
+        path, maxBytes=100, backupCount=1, flush_interval=60
+    )
+    logger = logging.getLogger("test_buffered_file_handler_rolls_over")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        logger.info("first record")
+        logger.info("second")
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    assert (tmp_path / "rotating.log.1").read_text() == "x" * 90 + "\n"
+    assert path.read_text() == "first record\nsecond\n"
+
+
+def test_run_command_raw_keeps_stdout_as_bytes():
+    """Test raw stdout is only kept undecoded and isn't passed to the callbacks."""
+    lines = []
+    result = run_command(
+        [
+            sys.executable,
+            "-c",
+            "import sys; print('{\"a\": 1}'); print('warn', file=sys.stderr)",
+        ],
+        line_callback=lambda line, error: lines.append((line, error)),
+        show_output=False,
+        raw=True,
+    )
+
+    assert result.stdout_bytes == b'{"a": 1}\n'
+    assert result.stdout == ""
+    assert result.stderr == "warn\n"
+    assert lines == [("", "warn\n")]
+
+
+def test_parse_vars_encodings_agree():
+    """Test the -var arguments and the var file encode the values the same way."""
+    values = {
+        "text": 'x "y"',
+        "flag": True,
+        "count": 3,
+        "list": [1, "a"],
+        "map": {"k": "v"},
+    }
+    variables = {f"v{i}": values[key] for i, key in enumerate(values)}
+
+    with Terraform.__parse_vars__(variables) as args:
+        cli_values = dict(arg.split("=", 1) for arg in args[1::2])
+
+    padded = {**variables, **{f"pad{i}": "" for i in range(MAX_CLI_VARS)}}
+    with Terraform.__parse_vars__(padded) as args:
+        assert len(args) == 1
+        with open(args[0].split("=", 1)[1], encoding="utf-8") as file:
+            file_values = json.load(file)
+
+    assert cli_values["v0"] == file_values["v0"] == 'x "y"'
+    for name in list(variables)[1:]:
+        assert json.loads(cli_values[name]) == file_values[name]
+
+
+def test_parse_vars_removes_var_file():
+    """Test the temporary var file only exists while the command runs."""
+    variables = {f"v{i}": i for i in range(MAX_CLI_VARS + 1)}
+
+    with Terraform.__parse_vars__(variables) as args:
+        path = args[0].split("=", 1)[1]
+        assert path.endswith(".auto.tfvars.json")
+        assert os.path.exists(path)
+    assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize(
+    "line,message",
+    [
+        (
+            '{"@level":"info","@message":"Apply complete!","type":"x"}',
+            "Apply complete!",
+        ),
+        (
+            '{"@message": "aws_s3_bucket.b: Creating \\"logs\\"...", "@level": "info"}',
+            'aws_s3_bucket.b: Creating "logs"...',
+        ),
+        ('{"@message":"count \\u003c 3 \\u0026 ok"}', "count < 3 & ok"),
+        ('{"@message":"path C:\\\\tmp\\ttab"}', "path C:\\tmp\ttab"),
+    ],
+)
+def test_apply_line_callback_message(monkeypatch, line, message):
+    """Test the @message of a JSON line is extracted and unescaped."""
+    messages = []
+    monkeypatch.setattr(log, "info", messages.append)
+
+    Terraform.__apply_line_callback__(line + "\n", "")
+
+    assert messages == [message]
+    assert messages[0] == json.loads(line)["@message"]
+
+
+def test_apply_line_callback_ignores_empty_stdout(monkeypatch):
+    """Test stderr only lines aren't parsed."""
+    messages = []
+    monkeypatch.setattr(log, "info", messages.append)
+
+    Terraform.__apply_line_callback__("", "some error\n")
+
+    assert messages == []
+
+
+@pytest.mark.parametrize(
+    "elapsed,expected",
+    [
+        (0, "0ms"),
+        (-0.5, "0ms"),
+        (0.25, "250ms"),
+        (1, "1s"),
+        (61.5, "1min, 1s, 500ms"),
+        (3600, "1h"),
+        (7322.042, "2h, 2min, 2s, 42ms"),
+    ],
+)
+def test_format_elapsed_time(elapsed, expected):
+    """Test the elapsed time is split in hours, minutes, seconds and milliseconds."""
+    start = 1700000000.0
+    assert format_elapsed_time(start, start + elapsed) == expected
+
+
+def test_plain_console_logs_task_start_once(tmp_path):
+    """Test a console that isn't a terminal gets no animation frames."""
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import time\n"
+            "from terraform_python.utils import log\n"
+            "task = log.start('long task')\n"
+            "time.sleep(0.7)\n"
+            "log.finish(task)\n",
+        ],
+        stdout=subprocess.PIPE,
+        cwd=tmp_path,
+        check=True,
+    )
+    lines = proc.stdout.decode().splitlines()
+
+    assert [line for line in lines if "RUNNING" in line] == [
+        next(line for line in lines if line.endswith("| long task"))
+    ]
+    assert sum("COMPLETED" in line and "long task" in line for line in lines) == 1
+
+
+class __StaleDeque__(collections.deque):
+    def __len__(self):
+        # Another thread emptied it right after the length was read
+        return 1
+
+
+def test_log_end_tasks_tolerates_concurrent_drain(monkeypatch):
+    """Test draining finished tasks doesn't fail when the other thread won the pop."""
+    monkeypatch.setattr(log, "__end_tasks__", __StaleDeque__())
+    log.__log_end_tasks__()